@@ -16,8 +16,18 @@ import (
 
 // find the sum of all the numbers
 
+// inputFile is the puzzle input, unless AOC_INPUT in the environment names
+// another file, e.g. a generated one. Answers are only checked on the
+// puzzle input.
+func inputFile() string {
+	if path := os.Getenv("AOC_INPUT"); path != "" {
+		return path
+	}
+	return "../../input/1"
+}
+
 func readInput() []string {
-	file, err := os.Open("../../input/1")
+	file, err := os.Open(inputFile())
 	if err != nil {
 		log.Fatal(err)
 	}
@@ -157,7 +167,7 @@ var answerFuncs = map[int]func() int{
 func printAndTest(question int) {
 	answer := answerFuncs[question]()
 	correctAnswer, ok := correctAnswers[question]
-	if ok && answer != correctAnswer {
+	if ok && os.Getenv("AOC_INPUT") == "" && answer != correctAnswer {
 		log.Fatal("Wrong answer, expected ", correctAnswer, " got ", answer)
 	}
 	println(answer)
@@ -17,8 +17,18 @@ import (
 // that is that have a number of balls equal or lower with the following:
 // 12 red cubes, 13 green cubes, and 14 blue cubes
 
+// inputFile is the puzzle input, unless AOC_INPUT in the environment names
+// another file, e.g. a generated one. Answers are only checked on the
+// puzzle input.
+func inputFile() string {
+	if path := os.Getenv("AOC_INPUT"); path != "" {
+		return path
+	}
+	return "../../input/2"
+}
+
 func readInput() []string {
-	file, err := os.Open("../../input/2")
+	file, err := os.Open(inputFile())
 	if err != nil {
 		log.Fatal(err)
 	}
@@ -155,7 +165,7 @@ var answerFuncs = map[int]func() int{
 func printAndTest(question int) {
 	answer := answerFuncs[question]()
 	correctAnswer, ok := correctAnswers[question]
-	if ok && answer != correctAnswer {
+	if ok && os.Getenv("AOC_INPUT") == "" && answer != correctAnswer {
 		log.Fatal("Wrong answer, expected ", correctAnswer, " got ", answer)
 	}
 	println(answer)
@@ -8,8 +8,18 @@ import (
 
 // PART 1
 
+// inputFile is the puzzle input, unless AOC_INPUT in the environment names
+// another file, e.g. a generated one. Answers are only checked on the
+// puzzle input.
+func inputFile() string {
+	if path := os.Getenv("AOC_INPUT"); path != "" {
+		return path
+	}
+	return "../../input/XXX"
+}
+
 func readInput() []string {
-	file, err := os.Open("../../input/XXX")
+	file, err := os.Open(inputFile())
 	if err != nil {
 		log.Fatal(err)
 	}
@@ -53,7 +63,7 @@ var answerFuncs = map[int]func() int{
 func printAndTest(question int) {
 	answer := answerFuncs[question]()
 	correctAnswer, ok := correctAnswers[question]
-	if ok && answer != correctAnswer {
+	if ok && os.Getenv("AOC_INPUT") == "" && answer != correctAnswer {
 		log.Fatal("Wrong answer, expected ", correctAnswer, " got ", answer)
 	}
 	println(answer)
@@ -0,0 +1,265 @@
+import os
+import sys
+import time
+import glob
+import argparse
+import importlib
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import bench
+import loader
+import crosslang
+import generators
+
+# Unified runner for all the days.
+
+# Usage (from the python directory):
+#   python -m aoc run                # all days, both parts
+#   python -m aoc run 1,5-9          # some days, both parts
+#   python -m aoc run 12 2           # only part 2 of day 12
+#   python -m aoc bench [days] [parts] # see bench.py
+#   python -m aoc generate day         # see generators.py
+#   python -m aoc solve 9 in1 in2 ...  # solve many inputs in one process
+#   python -m aoc imports              # check the import time of the days
+#   python -m aoc compare [days] [parts] # go vs python, see crosslang.py
+
+# Every (day, part) is run in its own task on a process pool, so a full run
+# takes about as long as the slowest part rather than the sum of all parts.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# importing all the days must stay well below this, heavy dependencies and
+# input parsing belong in the functions that need them, not at import time
+IMPORT_BUDGET = 0.1
+
+IMPORT_SCRIPT = """
+import sys, time, importlib
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(time.perf_counter() - start)
+"""
+
+def available_days():
+    """Return the sorted list of days that have a dayN.py module"""
+    days = []
+    for path in glob.glob(os.path.join(HERE, 'day*.py')):
+        name = os.path.basename(path)[3:-3]
+        if name.isdigit():
+            days.append(int(name))
+    return sorted(days)
+
+def parse_selection(selection, allowed):
+    """Parse a selection like '1,3,5-9' into a sorted list of ints. Ranges
+       only keep the values in allowed, single values must be in allowed.
+       No selection means all allowed values."""
+    if not selection:
+        return list(allowed)
+    chosen = set()
+    for item in selection.split(','):
+        if '-' in item:
+            first, last = item.split('-')
+            chosen.update(n for n in range(int(first), int(last) + 1)
+                          if n in allowed)
+        else:
+            chosen.add(int(item))
+    unknown = chosen - set(allowed)
+    if unknown:
+        raise ValueError(f'Not available: {sorted(unknown)}')
+    return sorted(chosen)
+
+class PartResult:
+    """The outcome of running one part of one day"""
+    def __init__(self, day, part, answer=None, expected=None,
+                 wall_time=0.0, cpu_time=0.0, error=None):
+        self.day = day
+        self.part = part
+        self.answer = answer
+        self.expected = expected
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.error = error
+
+    def status(self):
+        """Return 'error', 'fail', 'pass' or '-' if there is nothing to check"""
+        if self.error:
+            return 'error'
+        if self.expected is None:
+            return '-'
+        return 'pass' if self.answer == self.expected else 'fail'
+
+def run_part(day, part):
+    """Import the module of the day, run one of its answers and return
+       a PartResult. Meant to run in a worker process."""
+    result = PartResult(day, part)
+    try:
+        module = importlib.import_module(f'day{day}')
+        func = getattr(module, f'answer_{part}')
+        result.expected = getattr(module, f'CORRECT_ANSWER_{part}', None)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        result.answer = func()
+        result.wall_time = time.perf_counter() - wall_start
+        result.cpu_time = time.process_time() - cpu_start
+    except Exception as e:  # pylint: disable=broad-except
+        result.error = f'{type(e).__name__}: {e}'
+    return result
+
+def run(days, parts, workers=None):
+    """Run all the parts of the days on a process pool and return the list
+       of PartResult ordered by day and part"""
+    tasks = [(day, part) for day in days for part in parts]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_part, day, part) for day, part in tasks]
+        return [future.result() for future in futures]
+
+def print_results(results, wall_time):
+    print(f'{"day":>4} {"part":>4} {"wall (s)":>10} {"cpu (s)":>10} '
+          f'{"status":>6}  answer')
+    for r in results:
+        answer = r.error if r.error else r.answer
+        print(f'{r.day:>4} {r.part:>4} {r.wall_time:>10.3f} {r.cpu_time:>10.3f} '
+              f'{r.status():>6}  {answer}')
+    cpu_time = sum(r.cpu_time for r in results)
+    print(f'total wall time {wall_time:.3f}s, total cpu time {cpu_time:.3f}s')
+
+def command_run(args):
+    days = parse_selection(args.days, available_days())
+    parts = parse_selection(args.parts, [1, 2])
+    start = time.perf_counter()
+    results = run(days, parts, args.workers)
+    print_results(results, time.perf_counter() - start)
+    return 1 if any(r.status() in ('fail', 'error') for r in results) else 0
+
+def command_bench(args):
+    days = parse_selection(args.days, available_days())
+    parts = parse_selection(args.parts, [1, 2])
+    scales = [int(scale) for scale in args.scales.split(',')]
+    results = bench.run(days, parts, scales, args.repeat, args.workers)
+    baseline = bench.load_baseline(args.baseline)
+    bench.print_results(results, baseline)
+    if args.save:
+        bench.save_baseline(results, args.baseline)
+        return 0
+    found = bench.regressions(results, baseline, args.threshold)
+    for k, message in found:
+        print(f'REGRESSION {k}: {message}')
+    return 1 if found else 0
+
+def command_compare(args):
+    # the days solved in both languages, with a generator for their inputs
+    both = [day for day in available_days()
+            if day in crosslang.go_days() and day in generators.GENERATORS]
+    days = parse_selection(args.days, both)
+    parts = parse_selection(args.parts, [1, 2])
+    scales = [int(scale) for scale in args.scales.split(',')]
+    results = crosslang.run(days, parts, scales, args.repeat)
+    crosslang.print_results(results)
+    return 0 if all(crosslang.agree(r) for r in results) else 1
+
+def solve_files(day, paths):
+    """Generate (path, (answer 1, answer 2)) solving each input file with the
+       solve(text) of the day, all in this process"""
+    module = importlib.import_module(f'day{day}')
+    for path in paths:
+        yield path, module.solve(loader.read_text(path))
+
+def command_solve(args):
+    for path, (answer_1, answer_2) in solve_files(args.day, args.files):
+        print(f'{path}\t{answer_1}\t{answer_2}')
+    return 0
+
+def import_time(modules):
+    """Return the seconds a fresh interpreter takes to import modules"""
+    completed = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT, *modules],
+                               cwd=HERE, capture_output=True, text=True,
+                               check=True)
+    return float(completed.stdout)
+
+def command_imports(args):
+    days = parse_selection(args.days, available_days())
+    modules = [f'day{day}' for day in days]
+    print(f'{"module":>8} {"import (ms)":>12}')
+    for module in modules:
+        print(f'{module:>8} {import_time([module]) * 1000:>12.1f}')
+    total = import_time(modules)
+    print(f'{"all":>8} {total * 1000:>12.1f}')
+    if total > args.budget:
+        print(f'Importing the days takes more than {args.budget * 1000:.0f}ms')
+        return 1
+    return 0
+
+def command_generate(args):
+    sys.stdout.write(generators.generate(args.day, args.scale, args.seed))
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='aoc')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run and check the answers')
+    run_parser.add_argument('days', nargs='?', help='e.g. 1,3,5-9 (default all)')
+    run_parser.add_argument('parts', nargs='?', help='1, 2 or 1,2 (default both)')
+    run_parser.add_argument('-j', '--workers', type=int, default=None,
+                            help='number of worker processes (default cpu count)')
+    run_parser.set_defaults(func=command_run)
+
+    bench_parser = commands.add_parser('bench', help='benchmark on scaled inputs')
+    bench_parser.add_argument('days', nargs='?', help='e.g. 1,3,5-9 (default all)')
+    bench_parser.add_argument('parts', nargs='?', help='1, 2 or 1,2 (default both)')
+    bench_parser.add_argument('--scales', default='1,10,100',
+                              help='input size multipliers (default 1,10,100)')
+    bench_parser.add_argument('--repeat', type=int, default=1,
+                              help='runs per measure, the best one is kept')
+    bench_parser.add_argument('--baseline', default=bench.BASELINE_FILE,
+                              help='baseline JSON file')
+    bench_parser.add_argument('--save', action='store_true',
+                              help='store the results in the baseline')
+    bench_parser.add_argument('--threshold', type=float,
+                              default=bench.DEFAULT_THRESHOLD,
+                              help='relative regression that fails the run')
+    bench_parser.add_argument('-j', '--workers', type=int, default=1,
+                              help='number of worker processes (default 1)')
+    bench_parser.set_defaults(func=command_bench)
+
+    generate_parser = commands.add_parser('generate',
+                                          help='print a synthetic input')
+    generate_parser.add_argument('day', type=int)
+    generate_parser.add_argument('--scale', type=int, default=1,
+                                 help='size multiplier (default 1)')
+    generate_parser.add_argument('--seed', type=int, default=0)
+    generate_parser.set_defaults(func=command_generate)
+
+    compare_parser = commands.add_parser('compare',
+                                         help='compare the go and python solutions')
+    compare_parser.add_argument('days', nargs='?', help='e.g. 1,2 (default all)')
+    compare_parser.add_argument('parts', nargs='?', help='1, 2 or 1,2 (default both)')
+    compare_parser.add_argument('--scales', default='1,10,100',
+                                help='input size multipliers (default 1,10,100)')
+    compare_parser.add_argument('--repeat', type=int, default=3,
+                                help='runs per measure, the best one is kept')
+    compare_parser.set_defaults(func=command_compare)
+
+    solve_parser = commands.add_parser('solve',
+                                       help='solve input files of a day')
+    solve_parser.add_argument('day', type=int)
+    # absolute paths, we change directory below
+    solve_parser.add_argument('files', nargs='+', type=os.path.abspath)
+    solve_parser.set_defaults(func=command_solve)
+
+    imports_parser = commands.add_parser('imports',
+                                         help='check the import time of the days')
+    imports_parser.add_argument('days', nargs='?', help='e.g. 1,3,5-9 (default all)')
+    imports_parser.add_argument('--budget', type=float, default=IMPORT_BUDGET,
+                                help='max seconds to import all the days')
+    imports_parser.set_defaults(func=command_imports)
+
+    args = parser.parse_args(argv)
+    # the days read their input with paths relative to this directory
+    os.chdir(HERE)
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
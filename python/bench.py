@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import tracemalloc
+import tempfile
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+
+import cache
+import generators
+
+# Benchmark suite: run the solvers of each day against generated inputs 1x,
+# 10x, 100x the size of the puzzle input, record time, throughput and peak
+# memory and compare them with a stored JSON baseline.
+# Answers are not checked, generated inputs have no known correct answer.
+
+# Usage (from the python directory):
+#   python -m aoc bench --save               # record a new baseline
+#   python -m aoc bench                      # compare with the baseline
+#   python -m aoc bench 12,16 2 --scales 1,10
+
+BASELINE_FILE = 'bench_baseline.json'
+
+# relative slowdown or memory growth above which a part is a regression
+DEFAULT_THRESHOLD = 0.25
+
+# below these values measurements are mostly noise, so they are never
+# reported as regressions
+MIN_SECONDS = 0.05
+MIN_PEAK_KB = 1024
+
+def scaled_input(day, scale, directory):
+    """Write a generated input for day at the given scale in directory and
+       return its path. Days without a generator are only benchmarked on the
+       puzzle input, at scale 1, and for the others we return None."""
+    if day not in generators.GENERATORS:
+        return f'../input/{day}' if scale == 1 else None
+    text = generators.generate(day, scale)
+    path = os.path.join(directory, f'{day}_x{scale}')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(text)
+    return path
+
+def measure(day, part, path, repeat=1):
+    """Run part of day on the input at path and return a dict with the best
+       time, the throughput and the peak memory allocated while solving.
+       Meant to run in a fresh worker process."""
+    # we want to measure the parsing too, not loading it from the cache
+    cache.ENABLED = False
+    module = importlib.import_module(f'day{day}')
+    module.INPUTFILE = path
+    func = getattr(module, f'answer_{part}')
+    # warm up, the first call also pays for the lazy imports of the day
+    func()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    # tracing memory slows down the solver, so we measure it in another run
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = os.path.getsize(path)
+    return {
+        'seconds': best,
+        'bytes': size,
+        'bytes_per_second': size / best if best else None,
+        'peak_kb': peak // 1024,
+    }
+
+def key(day, part, scale):
+    return f'{day}/{part}/x{scale}'
+
+def run(days, parts, scales, repeat=1, workers=1):
+    """Benchmark every (day, part, scale) and return a dict key: measure.
+       Every measure runs in a new process so that memory peaks do not
+       leak from one measure into the next one; by default they run one at a
+       time so that they do not compete for the cpu."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        tasks = []
+        for day in days:
+            for scale in scales:
+                path = scaled_input(day, scale, directory)
+                if path is None:
+                    print(f'skipped {day}/x{scale}: no input generator')
+                    continue
+                tasks.extend((day, part, scale, path) for part in parts)
+        with ProcessPoolExecutor(max_workers=workers,
+                                 max_tasks_per_child=1) as pool:
+            futures = {key(day, part, scale):
+                       pool.submit(measure, day, part, path, repeat)
+                       for day, part, scale, path in tasks}
+            for k, future in futures.items():
+                results[k] = future.result()
+    return results
+
+def load_baseline(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def save_baseline(results, path=BASELINE_FILE):
+    """Update the baseline at path with results"""
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+def regressions(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a list of (key, message) for the results that are worse than
+       the baseline by more than threshold"""
+    found = []
+    for k, result in results.items():
+        if k not in baseline:
+            continue
+        old = baseline[k]
+        if result['seconds'] > max(old['seconds'], MIN_SECONDS) * (1 + threshold):
+            found.append((k, f'time {old["seconds"]:.3f}s -> '
+                             f'{result["seconds"]:.3f}s'))
+        if result['peak_kb'] > max(old['peak_kb'], MIN_PEAK_KB) * (1 + threshold):
+            found.append((k, f'peak memory {old["peak_kb"]}KB -> '
+                             f'{result["peak_kb"]}KB'))
+    return found
+
+def print_results(results, baseline):
+    print(f'{"benchmark":>12} {"seconds":>10} {"MB/s":>10} {"peak KB":>10} '
+          f'{"baseline s":>10}')
+    for k, r in results.items():
+        mb_per_second = (r['bytes_per_second'] or 0) / 1e6
+        old = f'{baseline[k]["seconds"]:.3f}' if k in baseline else '-'
+        print(f'{k:>12} {r["seconds"]:>10.3f} {mb_per_second:>10.2f} '
+              f'{r["peak_kb"]:>10} {old:>10}')
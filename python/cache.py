@@ -0,0 +1,115 @@
+import os
+import functools
+
+import loader
+
+# Persistent cache of parsed inputs.
+
+# A parser decorated with @cached reads the INPUTFILE of its module and its
+# result is pickled in CACHE_DIR, keyed by a hash of the content of the input
+# file, of the source of the module and of the shared modules that parse
+# for it, so that it is parsed again when any of them changes. Later calls,
+# in this or in other runs, load the pickle instead of parsing the input
+# again.
+# The cache is capped at MAX_CACHE_BYTES, evicting the least recently used
+# entries first. Set AOC_CACHE=0 in the environment to disable it.
+# pickle and hashlib are imported when first needed, they would double the
+# import time of every day.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+ENABLED = os.environ.get('AOC_CACHE', '1') != '0'
+
+# the modules shared by the parsers of the days, in this directory
+SHARED_MODULES = ['loader.py', 'grid.py', 'cache.py']
+
+def file_hash(path):
+    """Return the sha256 hex digest of the content of the file at path"""
+    import hashlib
+    with loader.InputFile(path) as file:
+        return hashlib.sha256(file.data).hexdigest()
+
+def cache_key(parse):
+    """Return the cache key for the parser with the current INPUTFILE of
+       its module"""
+    import hashlib
+    module_globals = parse.__globals__
+    digest = hashlib.sha256()
+    digest.update(f'{parse.__module__}.{parse.__qualname__}'.encode())
+    digest.update(file_hash(module_globals['__file__']).encode())
+    for name in SHARED_MODULES:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+        digest.update(file_hash(path).encode())
+    digest.update(file_hash(module_globals['INPUTFILE']).encode())
+    return digest.hexdigest()
+
+def load(key):
+    """Return (True, value) for the cached key or (False, None) if missing"""
+    import pickle
+    path = os.path.join(CACHE_DIR, key + '.pickle')
+    try:
+        with open(path, 'rb') as file:
+            value = pickle.load(file)
+    except FileNotFoundError:
+        return False, None
+    except Exception:  # pylint: disable=broad-except
+        # a corrupted entry or one of a class that does not exist anymore,
+        # which a parallel run may be removing too
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return False, None
+    # the modification time is the time of last use, for the LRU eviction
+    os.utime(path)
+    return True, value
+
+def store(key, value):
+    """Store value in the cache under key, then evict the least recently
+       used entries while the cache is bigger than MAX_CACHE_BYTES"""
+    import pickle
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, key + '.pickle')
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as file:
+        pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+    # atomic, so that parallel runs never read a partial entry
+    os.replace(temporary_path, path)
+    evict()
+
+def evict(max_bytes=MAX_CACHE_BYTES):
+    entries = []
+    for entry in os.scandir(CACHE_DIR):
+        if entry.name.endswith('.pickle'):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+def clear():
+    if os.path.isdir(CACHE_DIR):
+        for entry in os.scandir(CACHE_DIR):
+            os.remove(entry.path)
+
+def cached(parse):
+    """Decorator for parsers with no arguments that read the INPUTFILE of
+       their module"""
+    @functools.wraps(parse)
+    def wrapper():
+        if not ENABLED:
+            return parse()
+        key = cache_key(parse)
+        found, value = load(key)
+        if not found:
+            value = parse()
+            store(key, value)
+        return value
+    return wrapper
@@ -0,0 +1,121 @@
+import os
+import time
+import tempfile
+import importlib
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import cache
+import generators
+
+# Cross-language benchmark: build the Go solutions, run them and the python
+# ones on the same generated inputs, check that their answers agree and
+# report their throughput side by side.
+
+# Usage (from the python directory):
+#   python -m aoc compare                  # all days solved in both languages
+#   python -m aoc compare 1 2 --scales 1,100
+
+# The Go binaries read the input file named by AOC_INPUT in the environment.
+# Their time is measured around the process, so it includes starting it
+# (about a millisecond), while the python time is measured around the answer
+# in an already running interpreter, after a first untimed run that imports
+# what the day needs, as in bench.py.
+
+GO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'go')
+
+def go_days():
+    """Return the sorted list of days that have a go/dayN/main.go"""
+    days = []
+    for name in os.listdir(GO_DIR):
+        if (name.startswith('day') and name[3:].isdigit() and
+                os.path.exists(os.path.join(GO_DIR, name, 'main.go'))):
+            days.append(int(name[3:]))
+    return sorted(days)
+
+def build_go(day, directory):
+    """Build the Go solution of day in directory and return the binary path"""
+    binary = os.path.join(directory, f'day{day}')
+    subprocess.run(['go', 'build', '-o', binary, f'./day{day}'],
+                   cwd=GO_DIR, check=True)
+    return binary
+
+def run_go(binary, part, path, repeat=1):
+    """Run part of a Go binary on the input at path and return the answer
+       and the best time"""
+    environment = dict(os.environ, AOC_INPUT=os.path.abspath(path))
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([binary, str(part)], env=environment,
+                                   capture_output=True, text=True, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    # Go's println writes to stderr
+    output = (completed.stdout + completed.stderr).split()
+    return int(output[-1]), best
+
+def run_python(day, part, path, repeat=1):
+    """Run part of the python solution of day on the input at path and
+       return the answer and the best time. Meant to run in a fresh worker
+       process."""
+    cache.ENABLED = False
+    module = importlib.import_module(f'day{day}')
+    module.INPUTFILE = path
+    func = getattr(module, f'answer_{part}')
+    # the days import numpy and other heavy modules on their first call, so
+    # a first untimed call keeps that out of the measure
+    func()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        answer = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return answer, best
+
+def run(days, parts, scales, repeat=1):
+    """Run Go and python on generated inputs for every (day, part, scale)
+       and return a list of dicts with the answers and the times"""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for day in days:
+            binary = build_go(day, directory)
+            for scale in scales:
+                path = os.path.join(directory, f'{day}_x{scale}')
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write(generators.generate(day, scale))
+                size = os.path.getsize(path)
+                for part in parts:
+                    go_answer, go_seconds = run_go(binary, part, path, repeat)
+                    with ProcessPoolExecutor(max_workers=1,
+                                             max_tasks_per_child=1) as pool:
+                        python_answer, python_seconds = pool.submit(
+                            run_python, day, part, path, repeat).result()
+                    results.append({
+                        'day': day, 'part': part, 'scale': scale,
+                        'bytes': size,
+                        'go_answer': go_answer, 'go_seconds': go_seconds,
+                        'python_answer': python_answer,
+                        'python_seconds': python_seconds,
+                    })
+    return results
+
+def agree(result):
+    return result['go_answer'] == result['python_answer']
+
+def print_results(results):
+    print(f'{"day":>4} {"part":>4} {"scale":>6} {"go MB/s":>10} '
+          f'{"py MB/s":>10} {"faster":>7} {"answers":>8}')
+    for r in results:
+        go_mb_per_second = r['bytes'] / r['go_seconds'] / 1e6
+        python_mb_per_second = r['bytes'] / r['python_seconds'] / 1e6
+        faster = 'go' if r['go_seconds'] < r['python_seconds'] else 'python'
+        answers = 'agree' if agree(r) else 'DIFFER'
+        print(f'{r["day"]:>4} {r["part"]:>4} {r["scale"]:>6} '
+              f'{go_mb_per_second:>10.2f} {python_mb_per_second:>10.2f} '
+              f'{faster:>7} {answers:>8}')
+    for r in results:
+        if not agree(r):
+            print(f'day {r["day"]} part {r["part"]} x{r["scale"]}: '
+                  f'go {r["go_answer"]}, python {r["python_answer"]}')
@@ -1,4 +1,7 @@
-import sys
+import os
+
+import instrument
+import loader
 
 
 # PART 1
@@ -11,26 +14,40 @@ import sys
 
 # find the sum of all the numbers
 
-def read_input_into_lines():
-    with open('../input/1', 'r', encoding='utf-8') as f:
-        return f.readlines()
-
-def first_digit(line):
-    for char in line:
-        if char.isdigit():
-            return char
+INPUTFILE = '../input/1'
 
-def last_digit(line):
-    for char in reversed(line):
-        if char.isdigit():
-            return char
+def read_input_into_lines():
+    return loader.read_lines(INPUTFILE)
+
+# Part 1 does not need to split the input into lines: we work on all its
+# bytes at once with numpy. We keep only the digits and the newlines, in
+# order: the first digit of a line is then a digit right after a newline
+# and the last one a digit right before a newline. Lines with no digits
+# add nothing.
+
+def part_1(data):
+    """Return the sum of the calibration values of the input data, a
+       bytes-like object"""
+    import numpy as np
+    array = np.frombuffer(data, dtype=np.uint8)
+    # bytes below '0' wrap around to big values in uint8
+    is_digit = array - np.uint8(ord('0')) < 10
+    marks = array[np.flatnonzero(is_digit | (array == ord('\n')))]
+    # a newline at both ends, so that every line is between two of them
+    marks = np.concatenate(([ord('\n')], marks, [ord('\n')]))
+    is_newline = marks == ord('\n')
+    is_digit = ~is_newline[1:-1]
+    firsts = marks[1:-1][is_newline[:-2] & is_digit]
+    lasts = marks[1:-1][is_digit & is_newline[2:]]
+    values = 10 * firsts.astype(np.int64) + lasts - 11 * ord('0')
+    return int(values.sum())
 
 CORRECT_ANSWER_1 = 54450
 def answer_1():
-    input_lines = read_input_into_lines()
-    nums = ((int(first_digit(line) + last_digit(line)))
-            for line in input_lines)
-    return sum(nums)
+    if os.path.getsize(INPUTFILE) > STREAMING_BYTES:
+        return streaming_sum(INPUTFILE, spelled=False)
+    with loader.InputFile(INPUTFILE) as file:
+        return part_1(file.data)
 
 ##########################################################################
 
@@ -44,51 +61,101 @@ NUMBER_WORDS = {
     'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9
 }
 
-NUMBERS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 0]
-
-def word_indexes(line):
-    # return a dictionary of all the positions of the keys in NUMBER_WORDS
-    # in line, using the values as keys, e.g., {2: [0, 4], 1: [1]}
-    indexes = {}
-    for word, num in NUMBER_WORDS.items():
-        index = line.find(word)
-        if index == -1:
-            continue
-        indexes[num] = []
-        while index != -1:
-            indexes[num].append(index)
-            index = line.find(word, index + 1)
-    return indexes
-
-def number_indexes(line):
-    # return a dictionsy of all the positions of the numbers in NUMBERS
-    # in line, e.g., {1: [0, 4], 2: [1]}
-    indexes = {}
-    for number in NUMBERS:
-        index = line.find(str(number))
-        if index == -1:
-            continue
-        indexes[number] = []
-        while index != -1:
-            indexes[number].append(index)
-            index = line.find(str(number), index + 1)
-    return indexes
+DIGITS = {str(number): number for number in range(10)}
+
+# We look for the digits and words with a trie, a dict of nested dicts
+# char : node, where the node that ends a word or digit has its value under
+# the key None. The first digit is the first match trying each start
+# position from the beginning of the line, the last digit the first match
+# trying them from the end, so overlapping words (e.g., "eightwo") are
+# found and we stop as soon as we find the digit, instead of searching the
+# whole line for each word.
+
+def build_trie(tokens):
+    """Return the trie of a dict token: value"""
+    trie = {}
+    for token, value in tokens.items():
+        node = trie
+        for char in token:
+            node = node.setdefault(char, {})
+        node[None] = value
+    return trie
+
+DIGITS_TRIE = build_trie(DIGITS)
+SPELLED_TRIE = build_trie(DIGITS | NUMBER_WORDS)
+
+def first_match(line, starts, trie):
+    """Return the value of the first token of trie found in line trying
+       the start positions in order"""
+    for start in starts:
+        node = trie.get(line[start])
+        end = start
+        while node is not None:
+            if None in node:
+                return node[None]
+            end += 1
+            if end == len(line):
+                break
+            node = node.get(line[end])
+    raise ValueError(f'No digit in {line}')
+
+def calibration_value(line, spelled=True):
+    """Return the number made of the first and the last digit of line,
+       with digits spelled out as words if spelled"""
+    trie = SPELLED_TRIE if spelled else DIGITS_TRIE
+    starts = range(len(line))
+    first = first_match(line, starts, trie)
+    last = first_match(line, reversed(starts), trie)
+    return 10 * first + last
+
+def part_2(input_lines):
+    return sum(calibration_value(line) for line in input_lines)
 
 CORRECT_ANSWER_2 = 54265
 def answer_2():
-    input_lines = read_input_into_lines()
-    res = 0
-    for line in input_lines:
-        d1 = word_indexes(line)
-        d2 = number_indexes(line)
-        indexes =  {key: d1.get(key, []) + d2.get(key, [])
-                    for key in set(d1) | set(d2)}
-        # first_digit is the key with the smallest value
-        first = min(indexes, key=lambda key: min(indexes[key]))
-        # last_digit is the key with the largest value
-        last = max(indexes, key=lambda key: max(indexes[key]))
-        res += int(str(first) + str(last))
-    return res
+    if os.path.getsize(INPUTFILE) > STREAMING_BYTES:
+        return streaming_sum(INPUTFILE, spelled=True)
+    return part_2(read_input_into_lines())
+
+##########################################################################
+
+# STREAMING
+
+# Calibration documents can be many gigabytes, too big to read into a list
+# of lines. Above STREAMING_BYTES the mapped file is split into chunks at
+# newline boundaries, a process pool sums the calibration values of each
+# chunk and we add up the partial sums. A worker holds one chunk at a time,
+# so memory does not depend on the size of the file.
+
+STREAMING_BYTES = 64 * 1024 * 1024
+CHUNK_BYTES = 16 * 1024 * 1024
+
+def chunk_sum(path, start, end, spelled):
+    """Return the sum of the calibration values of the lines of the file at
+       path between the offsets start and end"""
+    with loader.InputFile(path) as file:
+        if not spelled:
+            return part_1(file.data[start:end])
+        text = str(file.data[start:end], 'utf-8')
+    return sum(calibration_value(line, spelled)
+               for line in loader.split_lines(text))
+
+def streaming_sum(path, spelled, workers=None, chunk_bytes=CHUNK_BYTES):
+    """Return the sum of the calibration values of the file at path, one
+       chunk per task on a pool of workers (default cpu count)"""
+    from concurrent.futures import ProcessPoolExecutor
+    with loader.InputFile(path) as file:
+        bounds = file.chunk_bounds(chunk_bytes)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(chunk_sum, path, start, end, spelled)
+                   for start, end in bounds]
+        return sum(future.result() for future in futures)
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    return part_1(text.encode()), part_2(loader.split_lines(text))
 
 ##########################################################################
 
@@ -100,9 +167,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
@@ -1,5 +1,5 @@
-import sys
-import itertools
+import instrument
+from grid import Grid
 
 
 # PART 1
@@ -16,71 +16,50 @@ import itertools
 # horizontally or vertically.
 # Finally sum all the steps.
 
-def read_input_into_lines():
-    with open('../input/11', 'r', encoding='utf-8') as file:
-        return file.readlines()
-
-class World:
-    def __init__(self, lines):
-        self.grid = set()
-        for y, line in enumerate(lines):
-            line = line.strip()
-            for x, c in enumerate(line):
-                if c == '#':
-                    self.grid.add((x,y))
-        self.x_len = len(lines[0])
-        self.y_len = len(lines)
+INPUTFILE = '../input/11'
+
+GALAXY = ord('#')
 
 def world():
-    return World(read_input_into_lines())
+    return Grid.from_file(INPUTFILE)
 
-def is_line_empty(w, y):
-    for x in range(w.x_len):
-        if (x,y) in w.grid:
-            return False
-    return True
+def empty_lines(w):
+    """Return a boolean array, True for the lines with no galaxies"""
+    return ~(w.view() == GALAXY).any(axis=1)
 
-def is_column_empty(w, x):
-    for y in range(w.y_len):
-        if (x,y) in w.grid:
-            return False
-    return True
+def empty_columns(w):
+    """Return a boolean array, True for the columns with no galaxies"""
+    return ~(w.view() == GALAXY).any(axis=0)
 
 def expand_world(w, expansion_factor=2):
-    expansion_factor -= 1
-    empty_lines = []
-    empty_columns = []
-    for y in range(w.y_len-1, -1, -1):
-        if is_line_empty(w, y):
-            empty_lines.append(y)
-    for x in range(w.x_len-1, -1, -1):
-        if is_column_empty(w, x):
-            empty_columns.append(x)
-
-    # sorted by x, then y
-    points = sorted(w.grid, key=lambda p: (p[0], p[1]))
-    # print without newline at the end
-    for i, (x,y) in enumerate(points):
-        for yy in empty_lines:
-            if y > yy:
-                points[i] = (points[i][0],points[i][1]+expansion_factor)
-        for xx in empty_columns:
-            if x > xx:
-                points[i] = (points[i][0]+expansion_factor,points[i][1])
-    w.grid = set(points)
-
-def distance(p1, p2):
-    return abs(p1[0]-p2[0]) + abs(p1[1]-p2[1])
+    """Return the x and y coordinates of the galaxies as two arrays, after
+       expanding each empty line and column to expansion_factor of them"""
+    import numpy as np
+    ys, xs = np.nonzero(w.view() == GALAXY)
+    # count of empty lines (columns) up to each line (column); galaxies are
+    # never on empty ones, so for them this is the count of the ones before
+    xs = xs + np.cumsum(empty_columns(w))[xs] * (expansion_factor - 1)
+    ys = ys + np.cumsum(empty_lines(w))[ys] * (expansion_factor - 1)
+    return xs, ys
+
+def sum_of_distances(coordinates):
+    """Return the sum of the distances between all unordered pairs of
+       coordinates. Once sorted, the i-th coordinate is added for the i
+       coordinates before it and subtracted for the n - i - 1 after it."""
+    import numpy as np
+    coordinates = np.sort(coordinates)
+    n = len(coordinates)
+    weights = 2 * np.arange(n) - n + 1
+    # sum as python ints, the total can overflow int64 on big worlds
+    return sum((coordinates * weights).tolist())
+
+def part_1(w):
+    xs, ys = expand_world(w)
+    return sum_of_distances(xs) + sum_of_distances(ys)
 
 CORRECT_ANSWER_1 = 9918828
 def answer_1():
-    w = world()
-    expand_world(w)
-    total = 0
-    # list all unordered pairs of points
-    for p1,p2 in (itertools.combinations(w.grid, 2)):
-        total += distance(p1, p2)
-    return total
+    return part_1(world())
 
 ##########################################################################
 
@@ -88,15 +67,20 @@ def answer_1():
 
 # Now instead of expanding from 1 to 2 lines or columns, expand from 1 to 1000000
 
+def part_2(w):
+    xs, ys = expand_world(w, 1000000)
+    return sum_of_distances(xs) + sum_of_distances(ys)
+
 CORRECT_ANSWER_2 = 692506533832
 def answer_2():
-    w = world()
-    expand_world(w, 1000000)
-    total = 0
-    # list all unordered pairs of points
-    for p1,p2 in (itertools.combinations(w.grid, 2)):
-        total += distance(p1, p2)
-    return total
+    return part_2(world())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    w = Grid.from_text(text)
+    return part_1(w), part_2(w)
 
 ##########################################################################
 
@@ -108,9 +92,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
@@ -1,8 +1,10 @@
-import sys
 import re
 import itertools
 from collections import defaultdict
 
+import instrument
+import loader
+
 # PART 1
 
 # Your input is a series of lines with this format:
@@ -21,11 +23,12 @@ from collections import defaultdict
 # possible configuration, the second line has 10.
 # Sum all the possible configurations for all the lines in the input.
 
+INPUTFILE = '../input/12'
+
 def read_input_into_lines():
     """Read the input file and return it as a list of lines stripped of
        leading or trailing whitespace."""
-    with open('../input/12', 'r', encoding='utf-8') as file:
-        return [line.strip() for line in file.readlines()]
+    return loader.read_lines(INPUTFILE)
 
 def parse_line(line):
     """Parse a line of the input into a tuple of
@@ -53,10 +56,12 @@ def count_configurations(group, counts):
     return len([c for c in combinations
                 if valid(substitute(group, c), counts)])
 
+def part_1(lines):
+    return sum(count_configurations(*parse_line(line)) for line in lines)
+
 CORRECT_ANSWER_1 = 7939
 def answer_1():
-    return sum(count_configurations(*parse_line(line))
-               for line in read_input_into_lines())
+    return part_1(read_input_into_lines())
 
 ##########################################################################
 
@@ -115,11 +120,20 @@ def expand(group, counts, n=5):
     """Take a group and counts and return an expanded group and counts"""
     return(((group + '?') * n)[:-1], counts * n)
 
+def part_2(lines):
+    return sum(count_configurations_2(*expand(*parse_line(line)))
+               for line in lines)
+
 CORRECT_ANSWER_2 = 850504257483930
 def answer_2():
-    return sum(count_configurations_2(*expand(*parse_line(line)))
-               for line in read_input_into_lines())
+    return part_2(read_input_into_lines())
+
+##########################################################################
 
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    lines = loader.split_lines(text)
+    return part_1(lines), part_2(lines)
 
 ##########################################################################
 
@@ -131,9 +145,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
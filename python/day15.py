@@ -1,6 +1,8 @@
-import sys
 from collections import defaultdict
 
+import instrument
+import loader
+
 # PART 1
 
 # Your input is one line of comma-separated characters.
@@ -13,11 +15,17 @@ from collections import defaultdict
 #   4. Take the remainder of dividing by 256
 #   5. Repeat from step 2 for each character
 
+INPUTFILE = '../input/15'
+
+def groups_of(text):
+    """Return a generator of groups of characters of text splitting on
+       commas."""
+    return (group for group in text.strip().split(','))
+
 def generate_groups():
     """Read the input file into a string and return a generator of groups of
        characters splitting on commas."""
-    with open('../input/15', 'r', encoding='utf-8') as file:
-        return (group for group in file.read().strip().split(','))
+    return groups_of(loader.read_text(INPUTFILE))
 
 def hash_algo(group):
     """Run the HASH algorithm on a group of characters."""
@@ -26,9 +34,12 @@ def hash_algo(group):
         value = ( (value + ord(char)) * 17 ) % 256
     return value
 
+def part_1(groups):
+    return sum(hash_algo(group) for group in groups)
+
 CORRECT_ANSWER_1 = 513158
 def answer_1():
-    return sum(hash_algo(group) for group in generate_groups())
+    return part_1(generate_groups())
 
 ##########################################################################
 
@@ -51,20 +62,17 @@ def answer_1():
 # lenses (labels). The focusing power of a lens is found by multiplying together:
 # (1 + box numnber) * (position of label in box, starting from 1) * (value of label)
 
-# label : [box number, position in box, value]
-labels = {}
-
-# box : [length of box, set(labels)]
-boxes = {}
-
-def focusing_power(label):
+def focusing_power(label, labels):
     """Calculate the focusing power of a label."""
     box, position, value = labels[label]
     return (1 + box) * position * value
 
-CORRECT_ANSWER_2 = 200277
-def answer_2():
-    for instruction in generate_groups():
+def part_2(instructions):
+    # label : [box number, position in box, value]
+    labels = {}
+    # box : [length of box, set(labels)]
+    boxes = {}
+    for instruction in instructions:
         if '=' in instruction:
             label, value = instruction.split('=')
             value = int(value)
@@ -89,7 +97,17 @@ def answer_2():
                 for label in boxes[box][1]:
                     if labels[label][1] > position:
                         labels[label][1] -= 1
-    return sum(focusing_power(label) for label in labels)
+    return sum(focusing_power(label, labels) for label in labels)
+
+CORRECT_ANSWER_2 = 200277
+def answer_2():
+    return part_2(generate_groups())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    return part_1(groups_of(text)), part_2(groups_of(text))
 
 ##########################################################################
 
@@ -101,9 +119,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
@@ -1,4 +1,5 @@
-import sys
+import instrument
+from grid import Grid, DIRECTIONS
 
 
 # PART 1
@@ -27,84 +28,66 @@ import sys
 
 # Let the beam propagate and then count the number of cells traversed by it.
 
-def read_input_into_lines():
-    """Read the input file and return it as a list of lines stripped of
-       leading or trailing whitespace."""
-    with open('../input/16', 'r', encoding='utf-8') as file:
-        return [line.strip() for line in file.readlines()]
+INPUTFILE = '../input/16'
 
-class World:
-    def __init__(self, grid):
-        self.grid = grid
-        self.x_len = len(grid[0])
-        self.y_len = len(grid)
-
-    def get_type(self, pos):
-        x, y = pos
-        return self.grid[y][x]
-
-    def valid_pos(self, pos):
-        x, y = pos
-        return 0 <= x < self.x_len and 0 <= y < self.y_len
+# the world is padded with a border of OUTSIDE cells, where the beam stops
+OUTSIDE = ' '
 
 def build_world_from_input():
-    lines = read_input_into_lines()
-    return World(lines)
-
-def next_steps(pos, dirs, w):
-    """Return a list of tuple with the next cell and direction of the beam
-       given the current cell, direction and grid."""
-    x, y = pos
-    cell_type = w.get_type(pos)
-
-    steps = []
-
-    if ( cell_type == '.' or
-        (cell_type == '-' and (dirs in {(1, 0), (-1, 0)} )) or
-        (cell_type == '|' and (dirs in {(0, 1), (0, -1)}))
-    ):
-        steps.append( ((x + dirs[0], y + dirs[1]), dirs) )
-
-    elif cell_type == '\\':
-        steps.append( ((x + dirs[1], y + dirs[0]), (dirs[1], dirs[0])) )
-
-    elif cell_type == '/':
-        steps.append( ((x - dirs[1], y - dirs[0]), (-dirs[1], -dirs[0])) )
-
-    elif cell_type == '-':
-        steps.append( ((x + 1, y), (1, 0)) )
-        steps.append( ((x - 1, y), (-1, 0)) )
-
-    elif cell_type == '|':
-        steps.append( ((x, y + 1), (0, 1)) )
-        steps.append( ((x, y - 1), (0, -1)) )
-
-    return [(pos, dir) for pos, dir in steps if w.valid_pos(pos)]
-
+    return Grid.from_file(INPUTFILE, pad=1, fill=OUTSIDE)
+
+# The beam directions are indexes in DIRECTIONS: east, west, south, north
+EAST, WEST, SOUTH, NORTH = range(4)
+
+# For each cell type, the directions the beam takes leaving the cell given
+# the direction it is travelling in (the index in the tuple)
+TURNS = {
+    '.':  ((EAST,), (WEST,), (SOUTH,), (NORTH,)),
+    '/':  ((NORTH,), (SOUTH,), (WEST,), (EAST,)),
+    '\\': ((SOUTH,), (NORTH,), (EAST,), (WEST,)),
+    '-':  ((EAST,), (WEST,), (EAST, WEST), (EAST, WEST)),
+    '|':  ((SOUTH, NORTH), (SOUTH, NORTH), (SOUTH,), (NORTH,)),
+    OUTSIDE: ((), (), (), ()),
+}
+# the same indexed by the byte value of the cell type, for fast lookups
+TURNS_BY_BYTE = [None] * 256
+for cell_type, turns in TURNS.items():
+    TURNS_BY_BYTE[ord(cell_type)] = turns
 
 def count_activated(w, start_step):
     """Traverse the world w and starting the beam from start_step and return the
-       number of cells activated by the beam."""
-    start, dirs = start_step
-    frontier = [(start, dirs)]
-    traversed = set()  # set of (cell, dir) tuples
+       number of cells activated by the beam.
+       A beam state is encoded as an int: cell flat index * 4 + direction."""
+    (x, y), dirs = start_step
+    start = w.index(x, y) * 4 + DIRECTIONS.index(dirs)
+    cells, offsets = w.cells, w.offsets
+    outside = ord(OUTSIDE)
+    frontier = [start]
+    traversed = {start}
 
     while frontier:
-        pos, dirs = frontier.pop()
-        traversed.add((pos, dirs))
-        steps = next_steps(pos, dirs, w)
-        for step in steps:
+        pos, direction = divmod(frontier.pop(), 4)
+        for new_direction in TURNS_BY_BYTE[cells[pos]][direction]:
+            new_pos = pos + offsets[new_direction]
+            if cells[new_pos] == outside:
+                continue
+            step = new_pos * 4 + new_direction
             if step not in traversed:
+                traversed.add(step)
                 frontier.append(step)
 
-    return len({pos for pos, _ in traversed})
+    if instrument.ENABLED:
+        instrument.count('beam states expanded', len(traversed))
+    return len({step // 4 for step in traversed})
 
-CORRECT_ANSWER_1 = 8901
-def answer_1():
-    w = build_world_from_input()
+def part_1(w):
     start_step=((0, 0), (1, 0))
     return count_activated(w, start_step)
 
+CORRECT_ANSWER_1 = 8901
+def answer_1():
+    return part_1(build_world_from_input())
+
 ##########################################################################
 
 # PART 2
@@ -116,20 +99,28 @@ def answer_1():
 # Find the maximum number of cells traversed by the beam when starting from any
 # cell of the border.
 
-CORRECT_ANSWER_2 = 9064
-def answer_2():
-    w = build_world_from_input()
+def part_2(w):
     start_steps = []
-    for x in range(w.x_len):
+    for x in range(w.width):
         start_steps.append(((x, 0), (0, 1)))
-        start_steps.append(((x, w.y_len - 1), (0, -1)))
-    for y in range(w.y_len):
+        start_steps.append(((x, w.height - 1), (0, -1)))
+    for y in range(w.height):
         start_steps.append(((0, y), (1, 0)))
-        start_steps.append(((w.x_len - 1, y), (-1, 0)))
+        start_steps.append(((w.width - 1, y), (-1, 0)))
 
     # find the maximum number of traversed cells
     return max(count_activated(w, step) for step in start_steps)
 
+CORRECT_ANSWER_2 = 9064
+def answer_2():
+    return part_2(build_world_from_input())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    w = Grid.from_text(text, pad=1, fill=OUTSIDE)
+    return part_1(w), part_2(w)
 
 ##########################################################################
 
@@ -141,9 +132,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
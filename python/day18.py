@@ -1,6 +1,8 @@
-import sys
 from collections import defaultdict
 
+import instrument
+import loader
+
 
 # PART 1
 
@@ -18,11 +20,12 @@ from collections import defaultdict
 # trenched. Each trench or interior "cell" is one cubic meter.
 # Sum the total cubic meters.
 
+INPUTFILE = '../input/18'
+
 def read_input_into_lines():
     """Read the input file and return it as a list of lines stripped of
        leading or trailing whitespace."""
-    with open('../input/18', 'r', encoding='utf-8') as file:
-        return [line.strip() for line in file.readlines()]
+    return loader.read_lines(INPUTFILE)
 
 
 def move(pos, direction, length):
@@ -54,9 +57,8 @@ def dig_border(commands):
             current_pos = next_pos
     return border
 
-outside = set()
-def flood_fill(x, y, min_x, max_x, min_y, max_y, border):
-    """Mark cells outside the border and return a set of external cells"""
+def flood_fill(x, y, min_x, max_x, min_y, max_y, border, outside):
+    """Mark cells outside the border adding them to the set outside"""
     if x < min_x or x > max_x or y < min_y or y > max_y:
         return
     if (x, y) in border:
@@ -81,18 +83,18 @@ def flood_fill(x, y, min_x, max_x, min_y, max_y, border):
 
 def mark_outside_cells(border, min_x, max_x, min_y, max_y):
     """Return the set of external cells"""
+    outside = set()
     for x in range(min_x, max_x + 1):
-        flood_fill(x, min_y, min_x, max_x, min_y, max_y, border)
-        flood_fill(x, max_y, min_x, max_x, min_y, max_y, border)
+        flood_fill(x, min_y, min_x, max_x, min_y, max_y, border, outside)
+        flood_fill(x, max_y, min_x, max_x, min_y, max_y, border, outside)
     for y in range(min_y, max_y + 1):
-        flood_fill(min_x, y, min_x, max_x, min_y, max_y, border)
-        flood_fill(max_x, y, min_x, max_x, min_y, max_y, border)
+        flood_fill(min_x, y, min_x, max_x, min_y, max_y, border, outside)
+        flood_fill(max_x, y, min_x, max_x, min_y, max_y, border, outside)
     return outside
 
-CORRECT_ANSWER_1 = 41019
-def answer_1():
+def part_1(lines):
     commands = [(cmd[0], cmd[1]) for cmd in
-                (cmd.split() for cmd in read_input_into_lines())]
+                (cmd.split() for cmd in lines)]
     border = dig_border(commands)
     min_x = min(pos[0] for pos in border)
     max_x = max(pos[0] for pos in border)
@@ -102,6 +104,9 @@ def answer_1():
     len_internal = (max_x - min_x + 1) * (max_y - min_y + 1) - len(border) - len(external)
     return len(border) + len_internal
 
+CORRECT_ANSWER_1 = 41019
+def answer_1():
+    return part_1(read_input_into_lines())
 
 ##########################################################################
 
@@ -150,8 +155,7 @@ def calculate_area(vertices):
     return 0.5 * abs(sum(x1 * y2 - x2 * y1 for ((x1, y1), (x2, y2)) in
                         zip(vertices, vertices[1:] + vertices[:1])))
 
-CORRECT_ANSWER_2 = 96116995735219
-def answer_2():
+def part_2(lines):
     # We will use the shoelace formula to calculate the area of the polygon
     # defined by the border segments and Pick's theorem to calculate the
     # number of internal cells.
@@ -162,12 +166,23 @@ def answer_2():
     # Pick's theorem that relates area A, number of internal cells I and number of
     # points on the border B: A = I + B/2 - 1
 
-    commands = [parse_hex(cmd) for cmd in read_input_into_lines()]
+    commands = [parse_hex(cmd) for cmd in lines]
     border_len, border_vertices = mark_border(commands)
     area = calculate_area(border_vertices)
     internal = area - border_len / 2 + 1
     return int(border_len + internal)
 
+CORRECT_ANSWER_2 = 96116995735219
+def answer_2():
+    return part_2(read_input_into_lines())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    lines = loader.split_lines(text)
+    return part_1(lines), part_2(lines)
+
 ##########################################################################
 
 def print_and_test(func, correct_answer=None):
@@ -178,9 +193,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
@@ -1,4 +1,6 @@
-import sys
+import instrument
+import loader
+from cache import cached
 
 # PART 1
 
@@ -18,16 +20,11 @@ import sys
 
 # Process all parts and for the accepted ones, sum the values of all attributes.
 
+INPUTFILE = '../input/19'
+
 def read_input():
     """Read the input file and return a tuple (list[rules], list[parts])"""
-    with open('../input/19', 'r', encoding='utf-8') as file:
-        rules, parts = file.read().split('\n\n')
-    rules = [line.strip() for line in rules.split('\n')]
-    parts = [line.strip() for line in parts.split('\n')]
-    if rules[-1] == '':
-        rules.pop()
-    if parts[-1] == '':
-        parts.pop()
+    rules, parts = loader.read_blocks(INPUTFILE)
     return rules, parts
 
 class Condition:
@@ -68,6 +65,20 @@ def parse_parts(part_string):
     pairs = part_string.split(',')
     return {p.split('=')[0] : int(p.split('=')[1]) for p in pairs}
 
+def parse_rules_and_parts(blocks):
+    """Return a tuple (dict label: conditions, list of parts) from the
+       blocks of rules and parts"""
+    rule_strings, part_strings = blocks
+    rules = {label : conditions for label, conditions in
+             (parse_rules(r) for r in rule_strings)}
+    parts = [parse_parts(p) for p in part_strings]
+    return rules, parts
+
+@cached
+def read_rules_and_parts():
+    """Return a tuple (dict label: conditions, list of parts)"""
+    return parse_rules_and_parts(read_input())
+
 def is_accepted(part, rules, start_label='in'):
     """Return True if the part is accepted, False if rejected"""
     if start_label == 'A':
@@ -88,16 +99,14 @@ def is_accepted(part, rules, start_label='in'):
                 return is_accepted(part, rules, condition.label)
     raise ValueError('No label found for part')
 
-CORRECT_ANSWER_1 = 409898
-def answer_1():
-    rule_strings, part_strings = read_input()
-    rules = {label : conditions for label, conditions in
-             (parse_rules(r) for r in rule_strings)}
-    parts = [parse_parts(p) for p in part_strings]
-
+def part_1(rules, parts):
     accepted_parts = [p for p in parts if is_accepted(p, rules)]
     return sum(sum(p.values()) for p in accepted_parts)
 
+CORRECT_ANSWER_1 = 409898
+def answer_1():
+    return part_1(*read_rules_and_parts())
+
 ##########################################################################
 
 # PART 2
@@ -196,13 +205,22 @@ def build_accepted_paths(rules):
     return accepted_paths
 
 
-CORRECT_ANSWER_2 = 113057405770956
-def answer_2():
-    rule_strings, _ = read_input()
-    rules = dict(parse_rules(r) for r in rule_strings)
+def part_2(rules):
     accepted_paths = build_accepted_paths(rules)
     return sum(path.count_combinations() for path in accepted_paths)
 
+CORRECT_ANSWER_2 = 113057405770956
+def answer_2():
+    rules, _ = read_rules_and_parts()
+    return part_2(rules)
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    rules, parts = parse_rules_and_parts(loader.split_blocks(text))
+    return part_1(rules, parts), part_2(rules)
+
 ##########################################################################
 
 def print_and_test(func, correct_answer=None):
@@ -213,9 +231,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
@@ -1,5 +1,6 @@
-import sys
-from collections import defaultdict
+import instrument
+import loader
+from cache import cached
 
 
 # PART 1
@@ -11,40 +12,86 @@ from collections import defaultdict
 # that is that have a number of balls equal or lower with the following:
 # 12 red cubes, 13 green cubes, and 14 blue cubes
 
+INPUTFILE = '../input/2'
+
 def read_input_into_lines():
-    with open('../input/2', 'r', encoding='utf-8') as file:
-        return file.readlines()
+    return loader.read_lines(INPUTFILE)
 
 def game_id(game):
     """Return the game id"""
     return int(game.split(':')[0].split(' ')[1])
 
-def draws(game):
-    """Return a list of dicts of color to number of balls"""
-    res = []
-    for draw in game.split(':')[1].split(';'):
-        balls_data = defaultdict(int)
-        for part in draw.strip().split(','):
-            part = part.strip()
-            number, color = part.split(' ')
-            balls_data[color] = int(number)
-        res.append(balls_data)
-    return res
+COLORS = ('red', 'green', 'blue')
 
+def game_maxima(game):
+    """Return the max number of balls of each color in COLORS drawn in
+       the game"""
+    maxima = dict.fromkeys(COLORS, 0)
+    for draw in game.split(':')[1].split(';'):
+        for part in draw.split(','):
+            number, color = part.split()
+            maxima[color] = max(maxima[color], int(number))
+    return [maxima[color] for color in COLORS]
+
+# The games are stored as numpy columns: an array of the game ids and an
+# array of the max number of balls of each color drawn in each game, one
+# row per game and one column per color. These maxima are all we need to
+# check any bag limits and to compute the powers.
+
+def parse_games(lines):
+    """Return a tuple (array of game ids, array of maxima per game)"""
+    import numpy as np
+    ids = np.array([game_id(game) for game in lines], dtype=np.int64)
+    maxima = np.array([game_maxima(game) for game in lines], dtype=np.int64)
+    return ids, maxima.reshape(len(ids), len(COLORS))
+
+@cached
 def games_data():
-    """Split input into a dict of game id to a list of ball numbers"""
-    games = read_input_into_lines()
-    return {game_id(game): draws(game) for game in games}
-
-def is_valid(draw):
-    """Return whether a game is valid"""
-    return draw['red'] <= 12 and draw['green'] <= 13 and draw['blue'] <= 14
+    """Split input into the game ids and the maxima of each game"""
+    return parse_games(read_input_into_lines())
+
+LIMITS = (12, 13, 14)
+
+# We check limits in batches so that the boolean matrix limits x games
+# stays below this number of cells
+MAX_BATCH_CELLS = 1 << 24
+
+def weighted_valid_games(games, limits, weights):
+    """Return an array with, for each (red, green, blue) triple in limits,
+       the sum of the weights of the games valid with those limits, that is
+       the games with all their maxima below or equal to them"""
+    import numpy as np
+    _, maxima = games
+    limits = np.asarray(limits, dtype=np.int64).reshape(-1, len(COLORS))
+    result = np.empty(len(limits), dtype=np.int64)
+    batch = max(1, MAX_BATCH_CELLS // max(1, len(maxima)))
+    for start in range(0, len(limits), batch):
+        batch_limits = limits[start:start + batch]
+        valid = (maxima[None, :, :] <= batch_limits[:, None, :]).all(axis=2)
+        result[start:start + batch] = valid @ weights
+    return result
+
+def count_valid_games(games, limits):
+    """Return an array with the number of valid games for each (red,
+       green, blue) triple in limits"""
+    import numpy as np
+    ids, _ = games
+    ones = np.ones(len(ids), dtype=np.int64)
+    return weighted_valid_games(games, limits, ones)
+
+def sum_valid_game_ids(games, limits):
+    """Return an array with the sum of the ids of the valid games for each
+       (red, green, blue) triple in limits"""
+    ids, _ = games
+    return weighted_valid_games(games, limits, ids)
+
+def part_1(games):
+    """Return the sum of valid game ids"""
+    return int(sum_valid_game_ids(games, [LIMITS])[0])
 
 CORRECT_ANSWER_1 = 2406
 def answer_1():
-    """Return the sum of valid game ids"""
-    return sum(game_id for game_id, draws in games_data().items()
-               if all(is_valid(draw) for draw in draws))
+    return part_1(games_data())
 
 ##########################################################################
 
@@ -54,22 +101,65 @@ def answer_1():
 # Then multiply this minimum number of balls together to find the `power`
 # of that game. Return the sum of all powers.
 
-def minimum_balls(draws):
-    """Return the minimum number of balls needed to make a game valid"""
-    # calculate the max number of balls of each color for all draws in a game
-    min_balls = {}
-    for color in ['red', 'green', 'blue']:
-        min_balls[color] = max(draw[color] for draw in draws)
-    return min_balls
+def minimum_balls(games):
+    """Return the minimum number of balls of each color needed to make each
+       game valid, which are the max numbers of balls drawn"""
+    _, maxima = games
+    return maxima
+
+def power(balls):
+    """Return the power of each row of numbers of balls"""
+    return balls.prod(axis=-1)
 
-def power(draw):
-    """Return the power of a draw"""
-    return draw['red'] * draw['green'] * draw['blue']
+def part_2(games):
+    return int(power(minimum_balls(games)).sum())
 
 CORRECT_ANSWER_2 = 78375
 def answer_2():
-    data = games_data()
-    return sum(power(minimum_balls(draws)) for draws in data.values())
+    return part_2(games_data())
+
+##########################################################################
+
+# INCREMENTAL INGESTION
+
+# Game logs keep growing. A GameLog keeps the running totals of both parts
+# for a log file and the offset up to which it has read it, so that each
+# update only parses the games appended since the previous one.
+
+class GameLog:
+    def __init__(self, path, limits=LIMITS):
+        self.path = path
+        self.limits = limits
+        self.offset = 0             # bytes of the file already ingested
+        self.games = 0              # count of games ingested
+        self.valid_ids_sum = 0      # answer of part 1
+        self.powers_sum = 0         # answer of part 2
+
+    def update(self):
+        """Ingest the complete lines appended to the file since the last
+           update. A last line with no newline yet is left for the next
+           update, as it may still be being written."""
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            data = file.read()
+        end = data.rfind(b'\n') + 1
+        lines = [line for line in loader.split_lines(str(data[:end], 'utf-8'))
+                 if line]
+        self.offset += end
+        if lines:
+            games = parse_games(lines)
+            self.games += len(lines)
+            valid_ids = sum_valid_game_ids(games, [self.limits])
+            self.valid_ids_sum += int(valid_ids[0])
+            self.powers_sum += part_2(games)
+        return self
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    games = parse_games(loader.split_lines(text))
+    return part_1(games), part_2(games)
 
 ##########################################################################
 
@@ -81,9 +171,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
@@ -1,5 +1,5 @@
-import sys
-import numpy as np
+import instrument
+from grid import Grid
 
 
 # PART 1
@@ -10,59 +10,56 @@ import numpy as np
 # east or west. How many cells can you reach making exactly 64 steps?
 
 
-def read_input_into_lines():
-    """Read the input file and return it as a list of lines stripped of
-       leading or trailing whitespace."""
-    with open('../input/21', 'r', encoding='utf-8') as file:
-        return [line.strip() for line in file.readlines()]
+INPUTFILE = '../input/21'
 
-def is_valid_step(world, x, y):
-    if x < 0 or y < 0 or x >= len(world[0]) or y >= len(world):
-        return False
-    return world[y][x] != '#'
+ROCK = '#'
 
-def get_valid_steps(world, x, y):
-    return [(x,y) for (x,y) in [(x+1, y), (x-1, y), (x, y+1), (x, y-1)]
-            if is_valid_step(world, x, y)]
+def read_input_into_world():
+    """Read the input file and return it as a Grid padded with rocks, so
+       that steps never leave the grid."""
+    return Grid.from_file(INPUTFILE, pad=1, fill=ROCK)
 
 def get_start(world):
-    for y, line in enumerate(world):
-        for x, char in enumerate(line):
-            if char == 'S':
-                return (x,y)
-    raise ValueError('No start found')
+    starts = world.find('S')
+    if not starts:
+        raise ValueError('No start found')
+    return starts[0]
 
-def traverse_world(world, max_steps, start, steps_f=get_valid_steps):
+def traverse_world(world, max_steps, start):
     """Traverese the world starting from start and return a dict of
-       cell:steps pairs for all cells reachable in max_steps steps."""
+       cell:steps pairs for all cells reachable in max_steps steps.
+       Cells are flat indexes in the world grid."""
+    cells, offsets = world.cells, world.offsets
+    rock = ord(ROCK)
     frontier = [start]
     visited = {start: 0}
     for i in range(1, max_steps + 1):
         if not frontier:
             break
         new_frontier = []
-        for x, y in frontier:
-            for step in steps_f(world, x, y):
-                if step not in visited:
+        for pos in frontier:
+            for offset in offsets:
+                step = pos + offset
+                if cells[step] != rock and step not in visited:
                     visited[step] = i
                     new_frontier.append(step)
-                elif visited[step] > i:
-                    visited[step] = i
         frontier = new_frontier
     return visited
 
-def count_reachable_cells(world, max_steps, start, steps_f=get_valid_steps):
+def count_reachable_cells(world, max_steps, start):
     mod = max_steps % 2
-    visited = traverse_world(world, max_steps, start, steps_f)
+    visited = traverse_world(world, max_steps, start)
     return sum(1 for x in visited.values() if x % 2 == mod)
 
-CORRECT_ANSWER_1 = 3814
-def answer_1():
-    world = read_input_into_lines()
+def part_1(world):
     start = get_start(world)
     max_steps = 64
     return count_reachable_cells(world, max_steps, start)
 
+CORRECT_ANSWER_1 = 3814
+def answer_1():
+    return part_1(read_input_into_world())
+
 ##########################################################################
 
 # PART 2
@@ -81,18 +78,24 @@ def answer_1():
 # f(202300 * 131 + 65) to find the answer. Given the particular shape of the map,
 # this ideal solution luckily works.
 
-def is_valid_step_infinite(world, x, y):
-    n = len(world)
-    x = (x % n + n) % n
-    y = (y % n + n) % n
-    return world[y][x] != '#'
+# We cannot traverse an infinite world, but in max_steps we cannot go further
+# than a few copies of the map away from the start, so we traverse a world
+# made of enough copies of the map around the one with the start.
 
-def get_valid_steps_infinite(world, x, y):
-    return [(x,y) for (x,y) in [(x+1, y), (x-1, y), (x, y+1), (x, y-1)]
-            if is_valid_step_infinite(world, x, y)]
+def tiled_world(world, start, max_steps):
+    """Return a world made of copies of world, big enough to contain all
+       the cells reachable from start in max_steps, and the start in it"""
+    n = world.width
+    copies = 2 * (max_steps // n + 1) + 1
+    big_world = world.tiled(copies)
+    x, y = world.position(start)
+    center = copies // 2 * n
+    return big_world, big_world.index(x + center, y + center)
 
 def find_quadratic(a, b, c):
     """Given three points (x, y) return the coefficients of the quadratic"""
+    import numpy as np
+
     # Matrix with x values
     X = np.array([[a[0]**2, a[0], 1],
                   [b[0]**2, b[0], 1],
@@ -110,25 +113,32 @@ def quadratic_value(coef, x):
     a, b, c = coef
     return a * x**2 + b * x + c
 
-CORRECT_ANSWER_2 = 632257949158206
-def answer_2():
-    world = read_input_into_lines()
+def part_2(world):
     start = get_start(world)
     max_steps = 26501365
-    n = max_steps // len(world)   # 202300
-    rest = max_steps % len(world) # 65
+    n = max_steps // world.width   # 202300
+    rest = max_steps % world.width # 65
     # given f(steps) = count of cells reachable in steps,
     # calculate f(n * 131 + 65) at n = 0, 1, 2
-    a = count_reachable_cells(world, 0 * len(world) + rest, start,
-                              steps_f=get_valid_steps_infinite)
-    b = count_reachable_cells(world, 1 * len(world) + rest, start,
-                              steps_f=get_valid_steps_infinite)
-    c = count_reachable_cells(world, 2 * len(world) + rest, start,
-                              steps_f=get_valid_steps_infinite)
+    big_world, big_start = tiled_world(world, start, 2 * world.width + rest)
+    a = count_reachable_cells(big_world, 0 * world.width + rest, big_start)
+    b = count_reachable_cells(big_world, 1 * world.width + rest, big_start)
+    c = count_reachable_cells(big_world, 2 * world.width + rest, big_start)
     coef = find_quadratic((0, a), (1, b), (2, c))
     res = quadratic_value(coef, n)
     return int(res)
 
+CORRECT_ANSWER_2 = 632257949158206
+def answer_2():
+    return part_2(read_input_into_world())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    world = Grid.from_text(text, pad=1, fill=ROCK)
+    return part_1(world), part_2(world)
+
 ##########################################################################
 
 def print_and_test(func, correct_answer=None):
@@ -139,9 +149,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
@@ -1,6 +1,9 @@
-import sys
 from collections import defaultdict
 
+import instrument
+import loader
+from cache import cached
+
 # PART 1
 
 # Your puzzle input ia a list of lines like this:
@@ -97,20 +100,25 @@ class Brick:
                                      ((other.lowend.x, other.lowend.y),
                                       (other.highend.x, other.highend.y)))
 
+INPUTFILE = '../input/22'
+
 def read_input_into_lines():
     """Read the input file and return it as a list of lines stripped of
        leading or trailing whitespace."""
-    with open('../input/22', 'r', encoding='utf-8') as file:
-        return [line.strip() for line in file.readlines()]
+    return loader.read_lines(INPUTFILE)
 
-def get_bricks_by_highest_z():
+def parse_bricks(lines):
     """Return a dict z: list of bricks with highest z-coordinate z"""
     bricks = defaultdict(list)
-    for line in read_input_into_lines():
+    for line in lines:
         brick = Brick.from_line(line)
         bricks[brick.highend.z].append(brick)
     return bricks
 
+@cached
+def get_bricks_by_highest_z():
+    return parse_bricks(read_input_into_lines())
+
 def let_fall(bricks):
     """Let bricks fall down until reaching z=1 or suppor by another brick,
        and return the count of fallen blocks.
@@ -154,12 +162,15 @@ def get_removable(bricks):
                 removable.add(brick)
     return removable
 
-CORRECT_ANSWER_1 = 401
-def answer_1():
-    bricks = get_bricks_by_highest_z()
+def part_1(bricks):
+    """Return the count of removable bricks. The bricks dict is modified."""
     let_fall(bricks)
     return len(get_removable(bricks))
 
+CORRECT_ANSWER_1 = 401
+def answer_1():
+    return part_1(get_bricks_by_highest_z())
+
 ##########################################################################
 
 # PART 2
@@ -179,9 +190,8 @@ def count_falling(supporting, supported_by, removed_brick):
                 to_process.add(supported_brick)
     return len(fallen) - 1
 
-CORRECT_ANSWER_2 = 63491
-def answer_2():
-    bricks = get_bricks_by_highest_z()
+def part_2(bricks):
+    """Return the sum of the falling bricks. The bricks dict is modified."""
     let_fall(bricks)
 
     supporting = {}
@@ -199,6 +209,18 @@ def answer_2():
     return sum(count_falling(supporting, supported_by, removed_brick)
                for z in bricks.keys() for removed_brick in bricks[z])
 
+CORRECT_ANSWER_2 = 63491
+def answer_2():
+    return part_2(get_bricks_by_highest_z())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    lines = loader.split_lines(text)
+    # the bricks fall in place, so each part gets its own
+    return part_1(parse_bricks(lines)), part_2(parse_bricks(lines))
+
 ##########################################################################
 
 def print_and_test(func, correct_answer=None):
@@ -209,9 +231,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
@@ -1,6 +1,8 @@
-import sys
 from collections import defaultdict
 
+import instrument
+from grid import Grid
+
 
 # PART 1
 
@@ -14,42 +16,33 @@ from collections import defaultdict
 # single . tile in the bottom row. Never step on the same tile twice.
 # What is the longest path you can take?
 
-def read_input_into_lines():
-    """Read the input file and return it as a list of lines stripped of
-       leading or trailing whitespace."""
-    with open('../input/23', 'r', encoding='utf-8') as file:
-        return [line.strip() for line in file.readlines()]
+INPUTFILE = '../input/23'
+
+FOREST = '#'
+
+def read_input_into_world():
+    """Read the input file and return it as a Grid padded with forest, so
+       that steps never leave the grid. Positions are flat indexes in it."""
+    return Grid.from_file(INPUTFILE, pad=1, fill=FOREST)
 
 def get_start_and_end(world):
     """Return the start and end positions in world."""
-    start = [(x, 0) for x in range(len(world[0]))
-         if world[0][x] == '.'][0]
-    end = [(x, len(world) - 1) for x in range(len(world[-1]))
-              if world[len(world) - 1][x] == '.'][0]
+    first, last = 0, world.height - 1
+    start = world.index(bytes(world.row(first)).index(b'.'), first)
+    end = world.index(bytes(world.row(last)).index(b'.'), last)
     return start, end
 
-def is_valid_tile(world, to_pos):
-    """Return True if to_pos is a valid step from from_pos in world."""
-    x, y = to_pos
-    return (0 <= x < len(world[0]) and
-            0 <= y < len(world) and
-            world[y][x] != '#')
+def slopes(world):
+    """Return a dict of slope byte value -> offset of the only step allowed"""
+    east, west, south, north = world.offsets
+    return {ord('>'): east, ord('<'): west, ord('v'): south, ord('^'): north}
 
-def find_next_steps(world, from_pos):
+def find_next_steps(world, from_pos, slope_steps):
     """Return a list of all valid neighbours of position in world."""
-    x, y = from_pos
-    if world[y][x] == '>':
-        return [(x + 1, y)]
-    if world[y][x] == '<':
-        return [(x - 1, y)]
-    if world[y][x] == '^':
-        return [(x, y - 1)]
-    if world[y][x] == 'v':
-        return [(x, y + 1)]
-    neighbours = [(x + step_x, y + step_y)
-                  for step_x, step_y in
-                  [(0, 1), (0, -1), (1, 0), (-1, 0)]]
-    return [to for to in neighbours if is_valid_tile(world, to)]
+    cell = world.cells[from_pos]
+    if cell in slope_steps:
+        return [from_pos + slope_steps[cell]]
+    return find_neighbours(world, from_pos)
 
 class Path:
     """A path has a route (a list of positions) which cannot be empty.
@@ -82,9 +75,11 @@ class Path:
 def find_longest_path(world, start, end):
     """Find the longest path from start to end in world without stepping
        on a tile twice. Return the length of the path."""
+    slope_steps = slopes(world)
     path = Path([start])
     frontier = [path]
     longest_path = path
+    clones = 0
 
     while frontier:
         path = frontier.pop()
@@ -92,20 +87,25 @@ def find_longest_path(world, start, end):
             if len(path) > len(longest_path):
                 longest_path = path
             continue
-        for to in find_next_steps(world, path.current_pos()):
+        for to in find_next_steps(world, path.current_pos(), slope_steps):
             if to not in path:
                 new_path = path.clone()
+                clones += 1
                 new_path.add(to)
                 frontier.append(new_path)
 
+    if instrument.ENABLED:
+        instrument.count('paths cloned', clones)
     return len(longest_path)
 
-CORRECT_ANSWER_1 = 2186
-def answer_1():
-    world = read_input_into_lines()
+def part_1(world):
     start, end = get_start_and_end(world)
     return find_longest_path(world, start, end)
 
+CORRECT_ANSWER_1 = 2186
+def answer_1():
+    return part_1(read_input_into_world())
+
 ##########################################################################
 
 # PART 2
@@ -118,11 +118,9 @@ def answer_1():
 
 def find_neighbours(tiles, from_pos):
     """Return a list of all valid neighbours of position in world."""
-    x, y = from_pos
-    neighbours = [(x + step_x, y + step_y)
-                  for step_x, step_y in
-                  [(0, 1), (0, -1), (1, 0), (-1, 0)]]
-    return [to for to in neighbours if is_valid_tile(tiles, to)]
+    cells, forest = tiles.cells, ord(FOREST)
+    return [from_pos + offset for offset in tiles.offsets
+            if cells[from_pos + offset] != forest]
 
 def get_world_as_graph(tiles, start):
     """Return the world as a tuple (vertexes, edges) where the vertexes
@@ -200,6 +198,7 @@ def find_longest_path_on_graph(edges, start, end):
     path = GraphPath([start])
     frontier = [path]
     longest_path = path
+    clones = 0
 
     while frontier:
         path = frontier.pop()
@@ -210,9 +209,12 @@ def find_longest_path_on_graph(edges, start, end):
         for to, steps in edges[path.current_vertex()]:
             if to not in path:
                 new_path = path.clone()
+                clones += 1
                 new_path.add(to, steps)
                 frontier.append(new_path)
 
+    if instrument.ENABLED:
+        instrument.count('graph paths cloned', clones)
     return len(longest_path)
 
 def print_graph(edges):
@@ -222,13 +224,22 @@ def print_graph(edges):
     for v in vertexes:
         print(v, ':', edges[v])
 
-CORRECT_ANSWER_2 = 6802
-def answer_2():
-    tiles = read_input_into_lines()
+def part_2(tiles):
     start, end = get_start_and_end(tiles)
     world = get_world_as_graph(tiles, start)
     return find_longest_path_on_graph(world, start, end)
 
+CORRECT_ANSWER_2 = 6802
+def answer_2():
+    return part_2(read_input_into_world())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    world = Grid.from_text(text, pad=1, fill=FOREST)
+    return part_1(world), part_2(world)
+
 ##########################################################################
 
 def print_and_test(func, correct_answer=None):
@@ -239,9 +250,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
@@ -1,5 +1,6 @@
-import sys
-from sympy import symbols, Eq, solve
+import instrument
+import loader
+from cache import cached
 
 # PART 1
 
@@ -66,11 +67,20 @@ class Hailstone:
         """Return the line that the hailstone will follow, as a tuple of two points"""
         return (self.x, self.y), (self.x + self.vx, self.y + self.vy)
 
+INPUTFILE = '../input/24'
+
 def read_input_into_lines():
     """Read the input file and return it as a list of lines stripped of
        leading or trailing whitespace."""
-    with open('../input/24', 'r', encoding='utf-8') as file:
-        return [line.strip() for line in file.readlines()]
+    return loader.read_lines(INPUTFILE)
+
+def parse_stones(lines):
+    return [Hailstone.from_line(line) for line in lines]
+
+@cached
+def read_stones():
+    """Return the list of hailstones in the input file"""
+    return parse_stones(read_input_into_lines())
 
 def valid_point(x, y, stone):
     """Return true if the point (x, y) is in the future of the stone.
@@ -97,9 +107,7 @@ def will_collide(stone_1, stone_2):
     if status == 'coincident':
         True
 
-CORRECT_ANSWER_1 = 20963
-def answer_1():
-    stones = [Hailstone.from_line(line) for line in read_input_into_lines()]
+def part_1(stones):
     collisions = 0
     for i, stone_1 in enumerate(stones):
         for stone_2 in stones[i+1:]:
@@ -107,6 +115,10 @@ def answer_1():
                 collisions += 1
     return collisions
 
+CORRECT_ANSWER_1 = 20963
+def answer_1():
+    return part_1(read_stones())
+
 ##########################################################################
 
 # PART 2
@@ -133,9 +145,10 @@ def answer_1():
 # and find a solution for the new stone.
 
 
-CORRECT_ANSWER_2 = 999782576459892
-def answer_2():
-    stones = [Hailstone.from_line(line) for line in read_input_into_lines()]
+def part_2(stones):
+    # sympy takes more than 300ms to import, only pay for it when needed
+    from sympy import symbols, Eq, solve as solve_equations
+
     stone_1, stone_2, stone_3 = stones[0], stones[1], stones[2]
     x1, y1, z1 = stone_1.position()
     vx1, vy1, vz1 = stone_1.velocity()
@@ -155,12 +168,21 @@ def answer_2():
     eq8 = Eq(y + vy * t3, y3 + vy3 * t3)
     eq9 = Eq(z + vz * t3, z3 + vz3 * t3)
 
-    solution = solve([eq1, eq2, eq3, eq4, eq5, eq6, eq7, eq8, eq9],
+    solution = solve_equations([eq1, eq2, eq3, eq4, eq5, eq6, eq7, eq8, eq9],
                      [x, y, z, vx, vy, vz, t1, t2, t3])
 
     return sum(solution[0][0:3])
 
+CORRECT_ANSWER_2 = 999782576459892
+def answer_2():
+    return part_2(read_stones())
+
+##########################################################################
 
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    stones = parse_stones(loader.split_lines(text))
+    return part_1(stones), part_2(stones)
 
 ##########################################################################
 
@@ -172,9 +194,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
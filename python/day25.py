@@ -1,8 +1,11 @@
-import sys
 import copy
 import random
 from collections import defaultdict
 
+import instrument
+import loader
+from cache import cached
+
 
 # PART 1
 
@@ -17,11 +20,12 @@ from collections import defaultdict
 # two separate, disconnected groups.
 # Multiply the size of these two groups to get the answer.
 
+INPUTFILE = '../input/25'
+
 def read_input_into_lines():
     """Read the input file and return it as a list of lines stripped of
        leading or trailing whitespace."""
-    with open('../input/25', 'r', encoding='utf-8') as file:
-        return [line.strip() for line in file.readlines()]
+    return loader.read_lines(INPUTFILE)
 
 def parse_line(line):
     """Parse a line into a part and a list of connected parts."""
@@ -44,6 +48,10 @@ def build_graph(lines):
                 graph[connected_part].append(part)
     return graph
 
+@cached
+def read_graph():
+    return build_graph(read_input_into_lines())
+
 def contract(graph, u, v):
     """Merge the nodes u and v into a single node and remove self-loops"""
     for node in graph[v]:
@@ -70,19 +78,25 @@ def kargers_algorithm(graph):
         vertices = list(local_graph.keys())
         vertices_count[u] += vertices_count[v]
 
+    if instrument.ENABLED:
+        # every contraction merges two vertices, until there are two left
+        instrument.count('kargers runs')
+        instrument.count('contractions', len(graph) - 2)
     remaining_vertices = list(local_graph.keys())
     return (len(local_graph[remaining_vertices[0]]),
             vertices_count[remaining_vertices[0]],
             vertices_count[remaining_vertices[1]])
 
-CORRECT_ANSWER_1 = 592171
-def answer_1():
-    graph = build_graph(read_input_into_lines())
+def part_1(graph):
     while True:
         cut, group1, group2 = kargers_algorithm(graph)
         if cut == 3:
             return group1 * group2
 
+CORRECT_ANSWER_1 = 592171
+def answer_1():
+    return part_1(read_graph())
+
 ##########################################################################
 
 # PART 2
@@ -95,6 +109,13 @@ def answer_2():
 
 ##########################################################################
 
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text, there is
+       no part 2 on the last day"""
+    return part_1(build_graph(loader.split_lines(text))), None
+
+##########################################################################
+
 def print_and_test(func, correct_answer=None):
     answer = func()
     if correct_answer:
@@ -103,9 +124,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
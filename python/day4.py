@@ -1,4 +1,6 @@
-import sys
+import instrument
+import loader
+from cache import cached
 
 
 # PART 1
@@ -14,37 +16,68 @@ import sys
 
 # Calculate the total number of points you have across all cards.
 
-def read_input_into_lines():
-    with open('../input/4', 'r', encoding='utf-8') as file:
-        return file.readlines()
+INPUTFILE = '../input/4'
 
+def read_input_into_lines():
+    return loader.read_lines(INPUTFILE)
+
+# Each card is encoded as two bitsets, the winning numbers and the numbers
+# played, with bit n set for number n. The deck is then two numpy uint64
+# matrices with one row of 64 bit words per card, and the match counts of
+# all the cards are the bits set in their AND, in one go.
+
+def number_mask(numbers_string):
+    """Return the numbers in the string as an int with their bits set"""
+    mask = 0
+    for n in numbers_string.split():
+        mask |= 1 << int(n)
+    return mask
+
+def bitsets(masks, words):
+    """Return a uint64 array with one row of words 64 bit words per mask"""
+    import numpy as np
+    data = b''.join(mask.to_bytes(8 * words, 'little') for mask in masks)
+    return np.frombuffer(data, dtype='<u8').reshape(len(masks), words)
+
+def parse_cards(lines):
+    """Return a tuple of the bitsets of the winning numbers and of the
+    numbers you played, one row per card in the order of the lines (which
+    is the order of the card numbers)."""
+    winning_masks, played_masks = [], []
+    for line in lines:
+        winning_numbers_string, numbers_played_string = (
+            line.split(':')[1].split('|'))
+        winning_masks.append(number_mask(winning_numbers_string))
+        played_masks.append(number_mask(numbers_played_string))
+    biggest = max(winning_masks + played_masks, default=0)
+    words = biggest.bit_length() // 64 + 1
+    return bitsets(winning_masks, words), bitsets(played_masks, words)
+
+@cached
 def the_cards():
-    """Return a dictionary of cards, where the key is the card number and the
-    value is a tuple of the winning numbers and the numbers you played."""
-    cards = {}
-    for line in read_input_into_lines():
-        card_number_string, numbers_string = line.split(':')
-        card_number = int(card_number_string.split()[1])
-        winning_numbers_string, numbers_played_string = numbers_string.split('|')
-        winning_numbers = [int(n) for n in
-                           winning_numbers_string.strip().split()]
-        numbers_played = [int(n) for n in
-                          numbers_played_string.strip().split()]
-        cards[card_number] = (winning_numbers, numbers_played)
-    return cards
-
-def points_for(card):
-    """Return the number of points for the given card."""
-    winning_numbers, numbers_played = card
-    points = 0
-    for number in numbers_played:
-        if number in winning_numbers:
-            points = 1 if points == 0 else points * 2
-    return points
+    return parse_cards(read_input_into_lines())
+
+def popcount(array):
+    """Return the number of bits set in each row of a 2D uint64 array"""
+    import numpy as np
+    if hasattr(np, 'bitwise_count'):    # numpy >= 2.0
+        return np.bitwise_count(array).sum(axis=1, dtype=np.int64)
+    bits = np.unpackbits(array.view(np.uint8), axis=1)
+    return bits.sum(axis=1, dtype=np.int64)
+
+def match_counts(cards):
+    """Return an array of the number of winning numbers played per card"""
+    winning, played = cards
+    return popcount(winning & played)
+
+def part_1(cards):
+    # 0 matches is 0 points, then 1, 2, 4... on python ints, as cards can
+    # have more matches than int64 has bits
+    return sum((1 << count) >> 1 for count in match_counts(cards).tolist())
 
 CORRECT_ANSWER_1 = 18653
 def answer_1():
-    return sum(points_for(card) for card in the_cards().values())
+    return part_1(the_cards())
 
 ##########################################################################
 
@@ -56,29 +89,43 @@ def answer_1():
 # Process all cards you win and calculate the total cards you got
 # (including the starting cards).
 
-# let's memoize the cards we already processed
-# this is a dictionary card number : number of cards won
-won_cards_by_card_number = {}
-
-def cards_won_by(number, cards):
-    """Return the number of cards won by the given card number."""
-    if number in won_cards_by_card_number:
-        return won_cards_by_card_number[number]
-
-    winning_numbers, numbers_played = cards[number]
-    winning_played_numbers = [n for n in numbers_played if n in winning_numbers]
-    won_card_numbers = [number + n for n in range(1, len(winning_played_numbers)+1)]
-    total_cards_won = (
-        len(won_card_numbers) +
-        sum(cards_won_by(n, cards) for n in won_card_numbers)
-    )
-    won_cards_by_card_number[number] = total_cards_won
-    return total_cards_won
+# We go through the cards in order with the number of copies of each card:
+# a card with m matches adds its copies to each of the next m cards. Rather
+# than adding them to m cards, we record where the addition starts and
+# where it stops in a difference array and keep a running sum of it, so that
+# every card costs O(1) whatever its matches.
+
+def total_cards(match_counts):
+    """Return the total number of cards, originals and copies, given the
+    match count of each card in order"""
+    n = len(match_counts)
+    # copies won by the cards up to this one, added from this card on
+    delta = [0] * (n + 1)
+    won = 0
+    total = 0
+    for i, count in enumerate(match_counts):
+        won += delta[i]
+        copies = 1 + won
+        total += copies
+        if count:
+            delta[i + 1] += copies
+            # copies are never won past the last card
+            delta[min(i + 1 + count, n)] -= copies
+    return total
+
+def part_2(cards):
+    return total_cards(match_counts(cards).tolist())
 
 CORRECT_ANSWER_2 = 5921508
 def answer_2():
-    cards = the_cards()
-    return len(cards) + sum(cards_won_by(n, cards) for n in cards)
+    return part_2(the_cards())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    cards = parse_cards(loader.split_lines(text))
+    return part_1(cards), part_2(cards)
 
 ##########################################################################
 
@@ -90,9 +137,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
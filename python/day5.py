@@ -1,4 +1,8 @@
-import sys
+import bisect
+import functools
+
+import instrument
+import loader
 
 
 # PART 1
@@ -41,53 +45,145 @@ TEST = False
 DAY = "5"
 INPUTFILE = "../input/" + DAY + ("_test" if TEST else "")
 
-def read_input_into_string():
-    with open(INPUTFILE, 'r', encoding='utf-8') as file:
-        return file.read()
-
-data = read_input_into_string().split('\n\n')
-
-seeds = [int(seed) for seed in data[0].split()[1:]]
-seed_to_soil_map = [tuple(map(int, line.split())) for line in data[1].splitlines()[1:]]
-soil_to_fertilizer_map = [tuple(map(int, line.split())) for line in data[2].splitlines()[1:]]
-fertilizer_to_water_map = [tuple(map(int, line.split())) for line in data[3].splitlines()[1:]]
-water_to_light_map = [tuple(map(int, line.split())) for line in data[4].splitlines()[1:]]
-light_to_temperature_map = [tuple(map(int, line.split())) for line in data[5].splitlines()[1:]]
-temperature_to_humidity_map = [tuple(map(int, line.split())) for line in data[6].splitlines()[1:]]
-humidity_to_location_map = [tuple(map(int, line.split())) for line in data[7].splitlines()[1:]]
-
-# sort by the source_range_start
-seed_to_soil_map.sort(key=lambda x: x[1])
-soil_to_fertilizer_map.sort(key=lambda x: x[1])
-fertilizer_to_water_map.sort(key=lambda x: x[1])
-water_to_light_map.sort(key=lambda x: x[1])
-light_to_temperature_map.sort(key=lambda x: x[1])
-temperature_to_humidity_map.sort(key=lambda x: x[1])
-humidity_to_location_map.sort(key=lambda x: x[1])
-
-def destination(src, mapping):
-    """Take a source number and a mapping and returns the destination number.
-    We expect the mapping to be sorted by the first number in the tuple."""
+def read_input_into_blocks():
+    return loader.read_blocks(INPUTFILE)
+
+def parse_map(block):
+    """Return the source and destination categories of a block of lines
+       'X-to-Y map:' followed by the map, and the map as a list of tuples
+       (destination_range_start, source_range_start, range_length) sorted by
+       source_range_start"""
+    source, destination = block[0].split()[0].split('-to-')
+    mapping = [tuple(map(int, line.split())) for line in block[1:]]
+    mapping.sort(key=lambda x: x[1])
+    return source, destination, mapping
+
+class Almanac:
+    """The seeds and any number of maps, from the blocks of the input. Each
+       part is only parsed when first used."""
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    @functools.cached_property
+    def seeds(self):
+        return [int(seed) for seed in self.blocks[0][0].split()[1:]]
+
+    @functools.cached_property
+    def stages(self):
+        """The list of (source, destination, map), in order"""
+        return [parse_map(block) for block in self.blocks[1:]]
+
+    @property
+    def maps(self):
+        return [mapping for _, _, mapping in self.stages]
+
+    @functools.cached_property
+    def stage_functions(self):
+        """The piecewise function of each map, see below"""
+        return [piecewise(mapping) for mapping in self.maps]
+
+    @functools.cached_property
+    def function(self):
+        """The piecewise function of all the maps, see below"""
+        return compile_maps(self.maps)
+
+    def location_ranges(self, seed_ranges):
+        """Generate the merged location ranges of a list of seed ranges, in
+           any order and possibly overlapping, see part 2"""
+        ranges = seed_ranges
+        for function in self.stage_functions:
+            ranges = translate_ranges(ranges, function)
+        return ranges
+
+    def cursor_location_ranges(self, seed_ranges):
+        """The same as location_ranges, going through the maps with a
+           cursor instead of their breakpoints"""
+        ranges = seed_ranges
+        for mapping in self.maps:
+            ranges = destination_ranges(merge_ranges(sorted(ranges)), mapping)
+        return merge_ranges(sorted(ranges))
+
+def almanac():
+    return Almanac(read_input_into_blocks())
+
+# Every map is a piecewise linear function: each range of sources maps to
+# itself plus an offset. So is the composition of all the maps, from seed to
+# location, which we compile once: we store it as a sorted list of
+# breakpoints and the list of the offsets of the pieces starting at them.
+# Numbers from breakpoints[i] up to breakpoints[i + 1] (excluded) map to
+# themselves plus offsets[i], so a lookup is one bisect.
+
+def merge_pieces(breakpoints, offsets):
+    """Return the piecewise function (breakpoints, offsets) dropping the
+       breakpoints between two pieces with the same offset"""
+    merged_breakpoints, merged_offsets = [breakpoints[0]], [offsets[0]]
+    for breakpoint, offset in zip(breakpoints[1:], offsets[1:]):
+        if offset != merged_offsets[-1]:
+            merged_breakpoints.append(breakpoint)
+            merged_offsets.append(offset)
+    return merged_breakpoints, merged_offsets
+
+def piecewise(mapping):
+    """Return a map sorted by source_range_start as a piecewise function
+       (breakpoints, offsets) over the numbers from 0"""
+    breakpoints, offsets = [0], [0]
     for destination_range_start, source_range_start, range_length in mapping:
-        if source_range_start <= src < source_range_start + range_length:
-            return destination_range_start + src - source_range_start
-        if src < source_range_start:
-            return src
-    return src
-
-def location_from_seed(seed):
-    """Take a seed and return the location"""
-    soil = destination(seed, seed_to_soil_map)
-    fertilizer = destination(soil, soil_to_fertilizer_map)
-    water = destination(fertilizer, fertilizer_to_water_map)
-    light = destination(water, water_to_light_map)
-    temperature = destination(light, light_to_temperature_map)
-    humidity = destination(temperature, temperature_to_humidity_map)
-    return destination(humidity, humidity_to_location_map)
+        offset = destination_range_start - source_range_start
+        if source_range_start == breakpoints[-1]:
+            offsets[-1] = offset
+        else:
+            breakpoints.append(source_range_start)
+            offsets.append(offset)
+        breakpoints.append(source_range_start + range_length)
+        offsets.append(0)
+    return merge_pieces(breakpoints, offsets)
+
+def compose(first, second):
+    """Return the piecewise function of second(first(x))"""
+    first_breakpoints, first_offsets = first
+    second_breakpoints, second_offsets = second
+    breakpoints, offsets = [], []
+    for i, (start, offset) in enumerate(zip(first_breakpoints, first_offsets)):
+        end = (first_breakpoints[i + 1] if i + 1 < len(first_breakpoints)
+               else None)
+        # the piece maps to start + offset onwards, split it where that
+        # crosses the breakpoints of second
+        j = bisect.bisect_right(second_breakpoints, start + offset) - 1
+        while True:
+            breakpoints.append(start)
+            offsets.append(offset + second_offsets[j])
+            j += 1
+            if j == len(second_breakpoints):
+                break
+            start = second_breakpoints[j] - offset
+            if end is not None and start >= end:
+                break
+    return merge_pieces(breakpoints, offsets)
+
+def compile_maps(maps):
+    """Return the piecewise function of all the maps applied in order"""
+    return functools.reduce(compose, (piecewise(mapping) for mapping in maps))
+
+def lookup(function, x):
+    """Return the value of the piecewise function at x"""
+    breakpoints, offsets = function
+    return x + offsets[bisect.bisect_right(breakpoints, x) - 1]
+
+def lookup_many(function, xs):
+    """Return a numpy array of the values of the piecewise function at
+       each of xs, for millions of them at a time"""
+    import numpy as np
+    breakpoints, offsets = function
+    xs = np.asarray(xs, dtype=np.int64)
+    pieces = np.searchsorted(breakpoints, xs, side='right') - 1
+    return xs + np.asarray(offsets, dtype=np.int64)[pieces]
+
+def part_1(almanac):
+    return min(lookup(almanac.function, seed) for seed in almanac.seeds)
 
 CORRECT_ANSWER_1 = 35 if TEST else 278755257
 def answer_1():
-    return min(map(location_from_seed, seeds))
+    return part_1(almanac())
 
 ##########################################################################
 
@@ -103,8 +199,10 @@ def answer_1():
 # We are dealing with huge lists of numbers, so instead of analysing
 # one seed at a time we'll do by a a range at a time.
 
-seeds_ranges = [(seeds[i], seeds[i+1]) for i in range(0, len(seeds), 2)]
-seeds_ranges.sort()
+def seed_ranges_of(seeds):
+    seeds_ranges = [(seeds[i], seeds[i+1]) for i in range(0, len(seeds), 2)]
+    seeds_ranges.sort()
+    return seeds_ranges
 
 def match(range1, range2):
     """Take two ranges (start, length) and return a tuple of 3 elements:
@@ -132,42 +230,131 @@ def match(range1, range2):
     return(left, middle, right)
 
 def destination_ranges(source_ranges, mapping):
-    """Take a list of source ranges and an ordered mapping and returns an
-       ordered list of destination ranges."""
-    dest_ranges = []
+    """Take a sorted list of source ranges, which do not overlap, and an
+       ordered mapping and generate the destination ranges."""
     mapping_index = 0
     for to_process in source_ranges:
         while to_process:
             dest_start, range_start, range_length = mapping[mapping_index]
             left, middle, to_process = match(to_process, (range_start, range_length))
             if left:
-                dest_ranges.append(left)
+                yield left
             if middle:
-                dest_ranges.append((dest_start + middle[0] - range_start,
-                                    middle[1]))
+                yield dest_start + middle[0] - range_start, middle[1]
             if to_process:
                 if mapping_index == len(mapping) - 1:
-                    dest_ranges.append(to_process)
+                    yield to_process
                     break
                 mapping_index += 1
-    dest_ranges.sort()
-    return dest_ranges
-
-def locations_from_seed_ranges(seed_ranges):
-    """Take a list of seed ranges and return the locations"""
-    soil_ranges = destination_ranges(seed_ranges, seed_to_soil_map)
-    fertilizer_ranges = destination_ranges(soil_ranges, soil_to_fertilizer_map)
-    water_ranges = destination_ranges(fertilizer_ranges, fertilizer_to_water_map)
-    light_ranges = destination_ranges(water_ranges, water_to_light_map)
-    temperature_ranges = destination_ranges(light_ranges, light_to_temperature_map)
-    humidity_ranges = destination_ranges(temperature_ranges, temperature_to_humidity_map)
-    location_ranges = destination_ranges(humidity_ranges, humidity_to_location_map)
-    return location_ranges
+
+# The location ranges of the seed ranges go through the maps one at a time.
+# Each stage is a generator of the ranges it maps to, and between two stages
+# we merge the ranges that overlap or touch, so that their number does not
+# keep growing on long chains of maps with many ranges.
+
+def merge_ranges(ranges):
+    """Generate the ranges (start, length) merging those that overlap or
+       touch. The ranges must be sorted."""
+    current_start, current_end = None, None
+    for start, length in ranges:
+        if current_end is not None and start <= current_end:
+            current_end = max(current_end, start + length)
+            continue
+        if current_end is not None:
+            yield current_start, current_end - current_start
+        current_start, current_end = start, start + length
+    if current_end is not None:
+        yield current_start, current_end - current_start
+
+# With the breakpoints of a map, each range finds the first piece it
+# overlaps with one bisect and then walks the pieces until its end, so k
+# ranges over a map of m pieces cost O((k + m) log m) including sorting the
+# output, and unlike the cursor of destination_ranges this works for ranges
+# in any order, overlapping or not.
+
+def translate_ranges(ranges, function):
+    """Generate the merged ranges that the ranges (start, length) map to
+       with the piecewise function"""
+    breakpoints, offsets = function
+    translated = []
+    # overlapping ranges would map the same pieces more than once
+    for start, length in merge_ranges(sorted(ranges)):
+        end = start + length
+        i = bisect.bisect_right(breakpoints, start) - 1
+        while i < len(breakpoints) and breakpoints[i] < end:
+            piece_start = max(start, breakpoints[i])
+            piece_end = (min(end, breakpoints[i + 1])
+                         if i + 1 < len(breakpoints) else end)
+            translated.append((piece_start + offsets[i],
+                               piece_end - piece_start))
+            i += 1
+    return merge_ranges(sorted(translated))
+
+def range_minimum(function, start, length):
+    """Return the minimum of the piecewise function over the range (start,
+       length). The function grows within each piece, so the minimum is at
+       the start of the range or at one of the breakpoints in it."""
+    breakpoints, offsets = function
+    i = bisect.bisect_right(breakpoints, start) - 1
+    minimum = start + offsets[i]
+    for i in range(i + 1, len(breakpoints)):
+        if breakpoints[i] >= start + length:
+            break
+        minimum = min(minimum, breakpoints[i] + offsets[i])
+    return minimum
+
+def part_2(almanac):
+    return min(range_minimum(almanac.function, start, length)
+               for start, length in seed_ranges_of(almanac.seeds))
 
 CORRECT_ANSWER_2 = 46 if TEST else 26829166
 def answer_2():
-    location_ranges = locations_from_seed_ranges(seeds_ranges)
-    return location_ranges[0][0]
+    return part_2(almanac())
+
+##########################################################################
+
+# BENCHMARK
+
+# Compare the range engines, by stage with breakpoints or with a cursor, or
+# through the compiled function of all the maps, on the maps of a generated
+# input and many random seed ranges, which overlap:
+#   python -c 'import day5; print(day5.benchmark_range_engines())'
+
+def benchmark_range_engines(range_count=10000, scale=100, repeat=3, seed=0):
+    """Return a dict engine: best time to find the location ranges of
+       range_count random seed ranges"""
+    import time
+    import random
+    import generators
+    blocks = loader.split_blocks(generators.generate(5, scale, seed))
+    rng = random.Random(seed)
+    seed_ranges = [(rng.randrange(1 << 32), rng.randrange(1, 1 << 24))
+                   for _ in range(range_count)]
+    engines = {
+        'breakpoints': lambda a: list(a.location_ranges(seed_ranges)),
+        'cursor': lambda a: list(a.cursor_location_ranges(seed_ranges)),
+        'composed': lambda a: list(translate_ranges(seed_ranges, a.function)),
+    }
+    times, results = {}, {}
+    for name, engine in engines.items():
+        for _ in range(repeat):
+            # a new almanac each time, parsed, so that we measure building
+            # the breakpoints but not parsing, which is the same for all
+            a = Almanac(blocks)
+            a.stages    # pylint: disable=pointless-statement
+            start = time.perf_counter()
+            results[name] = engine(a)
+            elapsed = time.perf_counter() - start
+            times[name] = min(times.get(name, elapsed), elapsed)
+    assert results['breakpoints'] == results['cursor'] == results['composed']
+    return times
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    almanac = Almanac(loader.split_blocks(text))
+    return part_1(almanac), part_2(almanac)
 
 ##########################################################################
 
@@ -179,9 +366,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
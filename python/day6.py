@@ -1,6 +1,8 @@
-import sys
 import math
 
+import instrument
+import loader
+
 
 # PART 1
 
@@ -21,12 +23,12 @@ import math
 # For each race, calculate how many options you have for time spent pressing
 # the button and set a new record. Multiply all those options together.
 
+INPUTFILE = '../input/6'
+
 def read_input_into_lines():
-    with open('../input/6', 'r', encoding='utf-8') as file:
-        return file.readlines()
+    return loader.read_lines(INPUTFILE)
 
-def races():
-    race_data = read_input_into_lines()
+def races(race_data):
     times = race_data[0].split(':')[1].split()
     records = race_data[1].split(':')[1].split()
     return [(int(time), int(record)) for time, record in zip(times, records)]
@@ -34,15 +36,60 @@ def races():
 def distance(time_pressed, race_time):
     return (race_time - time_pressed) * time_pressed
 
+# Instead of trying every time_pressed, we solve the equation: time_pressed
+# beats the record when
+#   time_pressed * (race_time - time_pressed) > record
+#   time_pressed^2 - race_time * time_pressed + record < 0
+# so strictly between the two roots (race_time -/+ sqrt(discriminant)) / 2.
+# The roots are symmetric around race_time / 2: if low is the first
+# time_pressed that beats the record, race_time - low is the last one.
+# With math.isqrt the first guess of low is at most 1 too small, and exact
+# on integers of any size. A time_pressed on a root matches the record
+# without beating it, which the check after the guess takes care of.
+
 def count_record_options(race):
-    # return the list of times_pressed that beat the record
+    """Return the number of times_pressed that beat the record"""
     race_time, record = race
-    return len([time_pressed for time_pressed in range(1, race_time)
-               if distance(time_pressed, race_time) > record])
+    discriminant = race_time * race_time - 4 * record
+    if discriminant < 0:
+        return 0
+    low = max(1, (race_time - math.isqrt(discriminant)) // 2)
+    if distance(low, race_time) <= record:
+        low += 1
+    return max(0, race_time - 2 * low + 1)
+
+# For many races at once the same in numpy, on int64: race_time * race_time
+# and 4 * record must fit, and the float square root is rounded to the
+# integer one.
+
+MAX_BATCH_TIME = 1 << 31
+MAX_BATCH_RECORD = 1 << 60
+
+def count_record_options_batch(race_times, records):
+    """Return an array of the number of times_pressed that beat the record
+       for each race in two arrays of race times and records"""
+    import numpy as np
+    race_times = np.asarray(race_times, dtype=np.int64)
+    records = np.asarray(records, dtype=np.int64)
+    if (np.any(race_times >= MAX_BATCH_TIME) or
+            np.any(records >= MAX_BATCH_RECORD)):
+        raise ValueError('Race too long for int64, use count_record_options')
+    discriminants = race_times * race_times - 4 * records
+    roots = np.sqrt(np.maximum(discriminants, 0)).astype(np.int64)
+    # the float square root can be off by one either way
+    roots -= roots * roots > discriminants
+    roots += (roots + 1) * (roots + 1) <= discriminants
+    low = np.maximum(1, (race_times - roots) // 2)
+    low += low * (race_times - low) <= records
+    counts = np.maximum(0, race_times - 2 * low + 1)
+    return np.where(discriminants < 0, 0, counts)
+
+def part_1(race_data):
+    return math.prod(count_record_options(race) for race in races(race_data))
 
 CORRECT_ANSWER_1 = 625968
 def answer_1():
-    return math.prod(count_record_options(race) for race in races())
+    return part_1(read_input_into_lines())
 
 ##########################################################################
 
@@ -56,16 +103,25 @@ def answer_1():
 
 # Calculate the number of options for time_pressed that beat the record.
 
-def race():
-    """The time, record from the input file"""
-    race_data = read_input_into_lines()
+def race(race_data):
+    """The time, record from the lines of the input"""
     times = race_data[0].split(':')[1].split()
     records = race_data[1].split(':')[1].split()
     return (int(''.join(times)), int(''.join(records)))
 
+def part_2(race_data):
+    return count_record_options(race(race_data))
+
 CORRECT_ANSWER_2 = 43663323
 def answer_2():
-    return count_record_options(race())
+    return part_2(read_input_into_lines())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    lines = loader.split_lines(text)
+    return part_1(lines), part_2(lines)
 
 ##########################################################################
 
@@ -77,9 +133,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
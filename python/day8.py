@@ -1,7 +1,10 @@
-import sys
 import math
-from collections import defaultdict
-from functools import reduce
+import functools
+from array import array
+
+import instrument
+import loader
+from cache import cached
 
 # PART 1
 
@@ -19,35 +22,108 @@ from functools import reduce
 # Count how many steps you take to go from AAA to ZZZ following the instructions.
 # The instructions repeat indefintely until you reach ZZZ.
 
-def read_input():
-    with open('../input/8', 'r', encoding='utf-8') as file:
-        lines = file.readlines()
-    instructions = lines[0].strip()
+INPUTFILE = '../input/8'
+
+def parse_network(lines):
+    """Return the instructions and a dict node: (left node, right node)"""
+    instructions = lines[0]
     nodes = lines[2:]
     nodes = {key: value for key, value in (parse_node(node) for node in nodes)}
     return instructions, nodes
 
+@cached
+def read_input():
+    return parse_network(loader.read_lines(INPUTFILE))
+
 def parse_node(node_string):
-    """Parse a string `AAA = (BBB, BBB)` into a a tuple AAA, (BBB, BBB)"""
-    key = node_string[:3]
-    left = node_string[7:10]
-    right = node_string[12:15]
+    """Parse a string `AAA = (BBB, BBB)` into a a tuple AAA, (BBB, BBB).
+       Names can have any length."""
+    key, targets = node_string.split(' = ')
+    left, right = targets[1:-1].split(', ')
     return key, (left, right)
 
+# Rather than walking the network one instruction at a time, we compile it to
+# integer node ids in numpy arrays and precompute a block: the node reached
+# from every node after following the whole instructions string. From the
+# block we build binary lifting jumps, jumps[j][node] being the node reached
+# after 2^j blocks, so that the block in which a target is first reached is
+# found in O(log blocks) jumps, and the step within that block from the first
+# step a target is reached in one block from each node.
+# The walk from a node in blocks repeats after at most one block per node, so
+# if a target is ever reached it is in the first len(names) blocks, and that
+# many blocks are enough jumps.
+
+class Network:
+    def __init__(self, instructions, nodes):
+        """Compile the instructions and the dict node: (left node, right node)
+           to integer ids: next_nodes[move][node] is the node reached from
+           node by the move at an instruction, 0 for L and 1 for R"""
+        import numpy as np
+        self.names = list(nodes)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        lefts, rights = zip(*nodes.values())
+        self.next_nodes = np.array([[self.ids[left] for left in lefts],
+                                    [self.ids[right] for right in rights]],
+                                   dtype=np.int64)
+        self.moves = [int(instruction == 'R') for instruction in instructions]
+
+    @functools.cached_property
+    def block(self):
+        """The node reached from every node after all the instructions"""
+        import numpy as np
+        current = np.arange(len(self.names))
+        for move in self.moves:
+            current = self.next_nodes[move][current]
+        return current
+
+    @functools.cached_property
+    def jumps(self):
+        """The list of binary lifting jumps, jumps[j] is the block applied
+           2^j times"""
+        jumps = [self.block]
+        while 1 << len(jumps) < len(self.names):
+            jumps.append(jumps[-1][jumps[-1]])
+        return jumps
+
+    def first_steps(self, targets):
+        """Return the first step in 1..len(moves) at which a node of the
+           targets mask is reached from every node, 0 if none"""
+        import numpy as np
+        current = np.arange(len(self.names))
+        first_steps = np.zeros(len(self.names), dtype=np.int64)
+        for step, move in enumerate(self.moves, 1):
+            current = self.next_nodes[move][current]
+            first_steps[(first_steps == 0) & targets[current]] = step
+        return first_steps
+
+    def steps_to(self, start, is_target):
+        """Return the number of steps from the node start to the first node
+           for which is_target(node) is true"""
+        import numpy as np
+        targets = np.array([is_target(name) for name in self.names])
+        first_steps = self.first_steps(targets)
+        # reached[j][node] tells if a target is reached in the 2^j blocks
+        # from node
+        reached = [first_steps > 0]
+        for jump in self.jumps[:-1]:
+            reached.append(reached[-1] | reached[-1][jump])
+        node = self.ids[start]
+        blocks = 0
+        for level in reversed(range(len(self.jumps))):
+            if not reached[level][node]:
+                node = self.jumps[level][node]
+                blocks += 1 << level
+        if not first_steps[node]:
+            raise ValueError(f'No target is ever reached from {start}')
+        return blocks * len(self.moves) + int(first_steps[node])
+
+def part_1(instructions, nodes):
+    network = Network(instructions, nodes)
+    return network.steps_to('AAA', lambda node: node == 'ZZZ')
+
 CORRECT_ANSWER_1 = 11911
 def answer_1():
-    instructions, nodes = read_input()
-    next_node = 'AAA'
-    count_steps = 0
-    while True:
-        instruction = instructions[count_steps % len(instructions)]
-        if instruction == 'L':
-            next_node = nodes[next_node][0]
-        else:
-            next_node = nodes[next_node][1]
-        if next_node == 'ZZZ':
-            return count_steps + 1
-        count_steps += 1
+    return part_1(*read_input())
 
 ##########################################################################
 
@@ -68,65 +144,139 @@ class Cycle:
         self.steps_to_cycle = None      # steps to start the cycle
         self.steps_to_end_node = []     # steps to reach an end node
         self.length = None              # length of the cycle
+        self.pre_cycle_steps = set()    # steps to an end node before it
+        self.cycle_offsets = set()      # offsets of the end nodes in it
+
+    def close(self, steps_to_cycle, length):
+        """Set where the cycle starts and its length, and split the steps
+           to an end node before and in the cycle"""
+        self.steps_to_cycle = steps_to_cycle
+        self.length = length
+        for steps in self.steps_to_end_node:
+            if steps < steps_to_cycle:
+                self.pre_cycle_steps.add(steps)
+            else:
+                self.cycle_offsets.add((steps - steps_to_cycle) % length)
 
-def cycle(start_node, instructions, nodes):
-    """Detect a cycle and return it"""
+    def is_end_step(self, steps):
+        """Tell if the ghost is on an end node after steps"""
+        if steps < self.steps_to_cycle:
+            return steps in self.pre_cycle_steps
+        offset = (steps - self.steps_to_cycle) % self.length
+        return offset in self.cycle_offsets
 
+# A ghost is in a cycle as soon as it is again on a node at the same
+# instruction index. The step at which it was first on each (node id,
+# instruction index) is kept in a flat array of len(nodes) * len(instructions)
+# steps, so that checking it is one lookup, and the ghost stops at the first
+# state it visits twice.
+
+def cycle(start, moves, lefts, rights, ends):
+    """Detect the cycle of the ghost starting from the node id start and
+       return it. moves are the instructions, 0 for L and 1 for R, lefts and
+       rights the lists of next node ids and ends the list of end node flags
+       by node id."""
     c = Cycle()
-    count_steps = 0
-    next_node = start_node
-    visited_configurations = defaultdict(list)
-
-    while True:
-        instruction = instructions[count_steps % len(instructions)]
-        next_configuration = (next_node, instruction)
-
-        # we have a cycle if we have visited this configuration before
-        # and the number of steps since we last visited it is a multiple
-        # of the number of instructions
-        for steps in visited_configurations[next_configuration]:
-            if (count_steps - steps) % len(instructions) == 0:
-                c.length = count_steps - steps
-                c.steps_to_cycle = count_steps - c.length
-                return c
-
-        visited_configurations[next_configuration].append(count_steps)
-
-        if instruction == 'L':
-            next_node = nodes[next_node][0]
-        else:
-            next_node = nodes[next_node][1]
-        if is_end_node(next_node):
-            c.steps_to_end_node.append(count_steps + 1)
-
-        count_steps += 1
+    length = len(moves)
+    first_visits = array('q', [-1]) * (len(lefts) * length)
+    node = start
+    index = 0
+    steps = 0
+    while first_visits[node * length + index] < 0:
+        first_visits[node * length + index] = steps
+        node = rights[node] if moves[index] else lefts[node]
+        index += 1
+        if index == length:
+            index = 0
+        steps += 1
+        if ends[node]:
+            c.steps_to_end_node.append(steps)
+    steps_to_cycle = first_visits[node * length + index]
+    c.close(steps_to_cycle, steps - steps_to_cycle)
+    return c
+
+# Each ghost is independent, so on large networks their cycles are detected in
+# parallel on a pool of processes. Below PARALLEL_STATES states starting the
+# pool costs more than it saves.
+
+PARALLEL_STATES = 1 << 22
+
+def ghost_cycles(network, workers=None):
+    """Return the cycle of each ghost of the network, in a pool of workers
+       (default cpu count) if the network is large"""
+    starts = [network.ids[node] for node in network.names
+              if is_start_node(node)]
+    lefts, rights = network.next_nodes.tolist()
+    ends = [is_end_node(node) for node in network.names]
+    args = (network.moves, lefts, rights, ends)
+    if len(network.names) * len(network.moves) < PARALLEL_STATES:
+        return [cycle(start, *args) for start in starts]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(cycle, start, *args) for start in starts]
+        return [future.result() for future in futures]
 
 def lcm(a, b):
     """Return the least common multiple of a and b"""
     return abs(a * b) // math.gcd(a, b)
 
-def lcm_of_list(numbers):
-    """Return the least common multiple of a list of numbers"""
-    return reduce(lcm, numbers)
+def crt(residue_1, modulus_1, residue_2, modulus_2):
+    """Return the residue modulo lcm(modulus_1, modulus_2) of the steps that
+       are residue_1 modulo modulus_1 and residue_2 modulo modulus_2, or None
+       if there are none. The moduli do not have to be coprime."""
+    # https://en.wikipedia.org/wiki/Chinese_remainder_theorem
+    # steps = residue_1 + modulus_1 * k, and we solve
+    # modulus_1 * k = residue_2 - residue_1 modulo modulus_2
+    # which has solutions only if the gcd of the moduli divides the difference
+    gcd = math.gcd(modulus_1, modulus_2)
+    difference = residue_2 - residue_1
+    if difference % gcd:
+        return None
+    reduced = modulus_2 // gcd
+    k = difference // gcd * pow(modulus_1 // gcd, -1, reduced) % reduced
+    return (residue_1 + modulus_1 * k) % lcm(modulus_1, modulus_2)
+
+# The ghosts are all on an end node either at a step where one of them is
+# still before its cycle, of which there are only a few and which we check
+# one by one, or at a step where all of them are in their cycle. A ghost is
+# then on an end node at steps_to_cycle + offset modulo its cycle length, for
+# any of its cycle offsets: we combine the residues of the ghosts with the
+# Chinese remainder theorem into residues modulo the lcm of the lengths, and
+# take the first step of each after all the ghosts have started their cycle.
 
 def minimum_steps(cycles):
     """Return the minimum number of steps to reach an end node for all cycles"""
-    # This is a simplification of the Chinese remainder theorem which
-    # would be the general solution to this problem.
-    # The gods of the Advent put us in the simplied case :)
-    if all(c.steps_to_end_node[0] == c.length for c in cycles):
-        return lcm_of_list([c.steps_to_end_node[0] for c in cycles])
+    candidates = [steps for c in cycles for steps in c.pre_cycle_steps
+                  if all(other.is_end_step(steps) for other in cycles)]
 
-    # Implement the general solution
-    # https://en.wikipedia.org/wiki/Chinese_remainder_theorem
-    raise NotImplementedError
+    residues = {0}
+    modulus = 1
+    for c in cycles:
+        combined = (crt(residue, modulus, c.steps_to_cycle + offset, c.length)
+                    for residue in residues for offset in c.cycle_offsets)
+        residues = {residue for residue in combined if residue is not None}
+        modulus = lcm(modulus, c.length)
+    start = max(1, max(c.steps_to_cycle for c in cycles))
+    candidates.extend(start + (residue - start) % modulus
+                      for residue in residues)
+
+    if not candidates:
+        raise ValueError('The ghosts are never all on an end node')
+    return min(candidates)
+
+def part_2(instructions, nodes):
+    return minimum_steps(ghost_cycles(Network(instructions, nodes)))
 
 CORRECT_ANSWER_2 = 10151663816849
 def answer_2():
-    instructions, nodes = read_input()
-    start_nodes = [node for node in nodes if is_start_node(node)]
-    cycles = [cycle(node, instructions, nodes) for node in start_nodes]
-    return minimum_steps(cycles)
+    return part_2(*read_input())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    instructions, nodes = parse_network(loader.split_lines(text))
+    return part_1(instructions, nodes), part_2(instructions, nodes)
 
 ##########################################################################
 
@@ -138,9 +288,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
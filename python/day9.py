@@ -1,4 +1,10 @@
-import sys
+import math
+import operator
+import functools
+
+import instrument
+import loader
+from cache import cached
 
 
 # PART 1
@@ -24,36 +30,76 @@ import sys
 # So in this case, the next number in the sequence is 18. Sum all the next
 # numbers in the sequence for all lines in your input.
 
+INPUTFILE = '../input/9'
+
 def read_input_into_lines():
-    with open('../input/9', 'r', encoding='utf-8') as file:
-        return file.readlines()
+    return loader.read_lines(INPUTFILE)
 
-def input_sequences():
-    lines = read_input_into_lines()
+def parse_sequences(lines):
     return [[int(number) for number in line.split()] for line in lines]
 
-def next_value(line):
-    """Take a line and extrapolate the next value"""
-    last_numbers= [line[-1]]
-    while True:
-        # compute the difference between each number and the next one
-        numbers = [line[i+1] - line[i] for i in range(len(line)-1)]
-        # if all differences are zero, we're done
-        if all(number == 0 for number in numbers):
-            break
-        # otherwise, add the last number to the list of last numbers
-        last_numbers.append(numbers[-1])
-        # and replace the line with the differences
-        line = numbers
-    # now add the last numbers from the bottom up
-    for i in range(len(last_numbers)-1, 0, -1):
-        last_numbers[i-1] += last_numbers[i]
-    return last_numbers[0]
+@cached
+def input_sequences():
+    return parse_sequences(read_input_into_lines())
+
+# Rather than building the difference pyramid of every sequence, we use that
+# the difference pyramid of a sequence of n values a_0 .. a_n-1 ends with
+# zeros at most at its n-th line, so the extrapolated values are those of the
+# polynomial of degree < n through the values, and the next one is a fixed
+# combination of them, the same for all the sequences of n values:
+#   next = sum of (-1)^(n-1-i) * C(n, i) * a_i
+#   previous = sum of (-1)^i * C(n, i+1) * a_i
+# We stack the sequences of the same length in an int64 matrix and get all
+# their extrapolated values with one product of the matrix by the weights.
+# The weights add up to 2^n in absolute value, so when the largest value of
+# the matrix times 2^n times the number of sequences could overflow int64, we
+# fall back to exact python ints.
+
+@functools.cache
+def next_weights(length):
+    """Return the weights of the values of a sequence of length values in
+       its next value"""
+    return [(-1) ** (length - 1 - i) * math.comb(length, i)
+            for i in range(length)]
+
+@functools.cache
+def previous_weights(length):
+    """Return the weights of the values of a sequence of length values in
+       its previous value"""
+    return [(-1) ** i * math.comb(length, i + 1) for i in range(length)]
+
+def sum_extrapolated(sequences, weights):
+    """Return the sum of the extrapolated values of the sequences, given the
+       function returning the weights for a sequence length"""
+    import numpy as np
+    by_length = {}
+    for sequence in sequences:
+        by_length.setdefault(len(sequence), []).append(sequence)
+    total = 0
+    for length, group in by_length.items():
+        if not length:
+            continue
+        length_weights = weights(length)
+        try:
+            matrix = np.array(group, dtype=np.int64)
+            # on python ints, as np.abs overflows for -2^63
+            bound = max(int(matrix.max()), -int(matrix.min())) << length
+            fits = bound * len(group) < 1 << 63
+        except OverflowError:
+            fits = False
+        if fits:
+            total += int((matrix @ np.array(length_weights)).sum())
+        else:
+            total += sum(sum(map(operator.mul, sequence, length_weights))
+                         for sequence in group)
+    return total
+
+def part_1(sequences):
+    return sum_extrapolated(sequences, next_weights)
 
 CORRECT_ANSWER_1 = 1725987467
 def answer_1():
-    sequences = input_sequences()
-    return sum(next_value(seq) for seq in sequences)
+    return part_1(input_sequences())
 
 ##########################################################################
 
@@ -75,28 +121,22 @@ def answer_1():
 #        2 <-  2    2    2
 #                 0   0
 
-def previous_value(line):
-    """Take a line and extrapolate the previous value"""
-    first_numbers= [line[0]]
-    while True:
-        # compute the difference between each number and the next one
-        numbers = [line[i+1] - line[i] for i in range(len(line)-1)]
-        # if all differences are zero, we're done
-        if all(number == 0 for number in numbers):
-            break
-        # otherwise, add the first number to the list of first numbers
-        first_numbers.append(numbers[0])
-        # and replace the line with the differences
-        line = numbers
-    # now subtract the first numbers from the bottom up
-    for i in range(len(first_numbers)-1, 0, -1):
-        first_numbers[i-1] -= first_numbers[i]
-    return first_numbers[0]
+# The previous value is also a fixed combination of the values, with the
+# previous_weights of part 1.
+
+def part_2(sequences):
+    return sum_extrapolated(sequences, previous_weights)
 
 CORRECT_ANSWER_2 = 971
 def answer_2():
-    sequences = input_sequences()
-    return sum(previous_value(seq) for seq in sequences)
+    return part_2(input_sequences())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    sequences = parse_sequences(loader.split_lines(text))
+    return part_1(sequences), part_2(sequences)
 
 ##########################################################################
 
@@ -108,9 +148,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)
@@ -0,0 +1,457 @@
+import math
+import random
+import string
+import itertools
+
+# Generators of synthetic inputs, one per day, in the same format as the
+# puzzle inputs. They are seeded, so the same (day, scale, seed) always gives
+# the same input, and scale 1 gives an input about the size of the puzzle one.
+# Scale multiplies the number of records (lines, games, bricks, ...) or, for
+# the grid days, the area of the grid.
+
+# Usage (from the python directory):
+#   python -m aoc generate 12 --scale 100 --seed 7 > /tmp/12_x100
+
+def scaled_side(side, scale, odd=False):
+    """Return the side of a square grid with scale times the area of a grid
+       with the given side"""
+    side = max(3, round(side * math.sqrt(scale)))
+    if odd and side % 2 == 0:
+        side += 1
+    return side
+
+def names(alphabet, length=3):
+    """Generate unique names from alphabet, starting with the given length and
+       moving to longer names once all the shorter ones are used"""
+    while True:
+        for letters in itertools.product(alphabet, repeat=length):
+            yield ''.join(letters)
+        length += 1
+
+def shuffled_names(rng, count, alphabet=string.ascii_lowercase, exclude=()):
+    """Return count unique names from alphabet in random order"""
+    result = []
+    length = 2
+    while len(result) < count:
+        candidates = [name for name in itertools.islice(names(alphabet, length),
+                                                         len(alphabet) ** length)
+                      if name not in exclude]
+        rng.shuffle(candidates)
+        result.extend(candidates[:count - len(result)])
+        length += 1
+    return result
+
+##########################################################################
+
+NUMBER_WORDS = ['zero', 'one', 'two', 'three', 'four',
+                'five', 'six', 'seven', 'eight', 'nine']
+
+def day1(rng, scale):
+    """Lines of letters, digits and spelled digits with at least one digit"""
+    lines = []
+    for _ in range(1000 * scale):
+        tokens = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 8)):
+            kind = rng.random()
+            if kind < 0.4:
+                tokens.append(''.join(rng.choices(string.ascii_lowercase,
+                                                  k=rng.randint(1, 8))))
+            elif kind < 0.7:
+                tokens.append(rng.choice(NUMBER_WORDS[1:]))
+            else:
+                tokens.append(str(rng.randint(1, 9)))
+        rng.shuffle(tokens)
+        lines.append(''.join(tokens))
+    return '\n'.join(lines) + '\n'
+
+def day2(rng, scale):
+    """Games of draws of red, green and blue balls"""
+    lines = []
+    for game in range(1, 100 * scale + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(['red', 'green', 'blue'], rng.randint(1, 3))
+            draws.append(', '.join(f'{rng.randint(1, 20)} {color}'
+                                   for color in colors))
+        lines.append(f'Game {game}: ' + '; '.join(draws))
+    return '\n'.join(lines) + '\n'
+
+def day4(rng, scale):
+    """Scratchcards with 10 winning and 25 played numbers. No card wins
+       copies of cards past the end of the table."""
+    count = 199 * scale
+    width = len(str(count))
+    lines = []
+    for card in range(1, count + 1):
+        matches = min(rng.choice([0, 0, 0, 1, 1, 2, 3, 4, 5, 10]), count - card)
+        numbers = rng.sample(range(1, 100), 35 - matches)
+        winning = numbers[:10]
+        played = winning[:matches] + numbers[10:]
+        rng.shuffle(played)
+        lines.append(f'Card {card:>{width}}: ' +
+                     ' '.join(f'{n:>2}' for n in winning) + ' | ' +
+                     ' '.join(f'{n:>2}' for n in played))
+    return '\n'.join(lines) + '\n'
+
+ALMANAC_STAGES = ['seed', 'soil', 'fertilizer', 'water', 'light',
+                  'temperature', 'humidity', 'location']
+
+def day5(rng, scale, domain=2**32):
+    """An almanac whose maps are random permutations of ranges covering the
+       whole domain of numbers"""
+    seeds = []
+    for start in sorted(rng.sample(range(0, domain, domain // 64), 10)):
+        seeds.extend([start + rng.randrange(domain // 256),
+                      rng.randrange(1, domain // 256)])
+    blocks = ['seeds: ' + ' '.join(map(str, seeds))]
+    for source, destination in zip(ALMANAC_STAGES, ALMANAC_STAGES[1:]):
+        cuts = sorted(rng.sample(range(1, domain), 30 * scale - 1))
+        bounds = [0] + cuts + [domain]
+        lengths = [end - start for start, end in zip(bounds, bounds[1:])]
+        order = list(range(len(lengths)))
+        rng.shuffle(order)
+        lines = [f'{source}-to-{destination} map:']
+        destination_start = 0
+        for i in order:
+            lines.append(f'{destination_start} {bounds[i]} {lengths[i]}')
+            destination_start += lengths[i]
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks) + '\n'
+
+def day6(rng, scale):
+    """Races with a time and a record that can be beaten"""
+    times, records = [], []
+    for _ in range(4 * scale):
+        time = rng.randint(40, 99)
+        best = (time // 2) * (time - time // 2)
+        times.append(time)
+        records.append(rng.randint(best // 2, best - 1))
+    width = max(len(str(n)) for n in times + records) + 3
+    return ('Time:    ' + ''.join(f'{n:>{width}}' for n in times) + '\n' +
+            'Distance:' + ''.join(f'{n:>{width}}' for n in records) + '\n')
+
+def day8(rng, scale):
+    """A network where each ghost walks a ring whose length is a multiple of
+       the instructions length, with the end node last in the ring.
+       Node names are three characters, and more for the nodes in the rings
+       when there are too many of them."""
+    instructions = ''.join(rng.choices('LR', k=20 * scale))
+    multipliers = [3, 5, 7, 11, 13, 17]
+    ring_sizes = [len(instructions) * m for m in multipliers]
+    alphabet = string.ascii_uppercase + string.digits
+    needed = sum(ring_sizes) + 1
+    width = 3
+    while (len(alphabet) - 2) * len(alphabet) ** (width - 1) < needed:
+        width += 1
+    middle = [name for name in (''.join(p) for p in
+                                itertools.product(alphabet, repeat=width))
+              if name[-1] not in 'AZ']
+    rng.shuffle(middle)
+    decoy = middle.pop()
+    start_names = ['AAA'] + rng.sample([a + b + 'A' for a in alphabet
+                                        for b in alphabet if a + b != 'AA'],
+                                       len(multipliers) - 1)
+    end_names = ['ZZZ'] + rng.sample([a + b + 'Z' for a in alphabet
+                                      for b in alphabet if a + b != 'ZZ'],
+                                     len(multipliers) - 1)
+    nodes = [(decoy, decoy, decoy)]
+    for start, end, size in zip(start_names, end_names, ring_sizes):
+        ring = [middle.pop() for _ in range(size - 1)] + [end]
+        # the node at position k in the ring is always left at step k, so we
+        # know which instruction will be followed there
+        walk = [start] + ring
+        for k, node in enumerate(walk):
+            following = ring[k % len(ring)]
+            if instructions[k % len(instructions)] == 'L':
+                nodes.append((node, following, decoy))
+            else:
+                nodes.append((node, decoy, following))
+    rng.shuffle(nodes)
+    return (instructions + '\n\n' +
+            '\n'.join(f'{n} = ({l}, {r})' for n, l, r in nodes) + '\n')
+
+def day9(rng, scale):
+    """Sequences of 21 values of random polynomials"""
+    lines = []
+    for _ in range(200 * scale):
+        coefficients = [rng.randint(-9, 9) for _ in range(rng.randint(1, 7))]
+        values = [sum(c * x ** i for i, c in enumerate(coefficients))
+                  for x in range(rng.randint(-5, 0), 21)][-21:]
+        lines.append(' '.join(map(str, values)))
+    return '\n'.join(lines) + '\n'
+
+def day11(rng, scale):
+    """A map of galaxies with some empty rows and columns"""
+    side = scaled_side(140, scale)
+    empty_rows = set(rng.sample(range(side), side // 14))
+    empty_columns = set(rng.sample(range(side), side // 14))
+    lines = []
+    for y in range(side):
+        lines.append(''.join(
+            '#' if (y not in empty_rows and x not in empty_columns and
+                    rng.random() < 0.025) else '.'
+            for x in range(side)))
+    return '\n'.join(lines) + '\n'
+
+def day12(rng, scale):
+    """Spring records, some springs unknown, with the counts of the
+       contiguous damaged springs"""
+    lines = []
+    for _ in range(1000 * scale):
+        springs = ''.join(rng.choice('.#') for _ in range(rng.randint(6, 20)))
+        counts = [len(group) for group in springs.split('.') if group]
+        if not counts:
+            springs = '#' + springs[1:]
+            counts = [len(group) for group in springs.split('.') if group]
+        record = ''.join('?' if rng.random() < 0.5 else c for c in springs)
+        lines.append(record + ' ' + ','.join(map(str, counts)))
+    return '\n'.join(lines) + '\n'
+
+def mirrored(rows, line):
+    """Return the rows with the ones after line replaced by the reflection
+       of the ones before it"""
+    rows = list(rows)
+    for i in range(min(line, len(rows) - line)):
+        rows[line + i] = rows[line - 1 - i]
+    return rows
+
+def reflection_diffs(rows, line):
+    """Return the number of cells that differ reflecting rows on the line
+       between rows[line - 1] and rows[line]"""
+    return sum(a != b
+               for i in range(min(line, len(rows) - line))
+               for a, b in zip(rows[line - 1 - i], rows[line + i]))
+
+def has_only_expected_reflections(rows, row_line, column_line):
+    """Return True if the only perfect reflection is on row_line and the only
+       reflection with one smudge is on column_line"""
+    columns = list(zip(*rows))
+    return (all((reflection_diffs(rows, line) == 0) == (line == row_line) and
+                reflection_diffs(rows, line) != 1
+                for line in range(1, len(rows))) and
+            all((reflection_diffs(columns, line) == 1) == (line == column_line) and
+                reflection_diffs(columns, line) != 0
+                for line in range(1, len(columns))))
+
+def day13(rng, scale):
+    """Patterns with a perfect horizontal reflection and a vertical
+       reflection with exactly one smudge"""
+    patterns = []
+    while len(patterns) < 100 * scale:
+        height, width = rng.randint(7, 17), rng.randint(7, 17)
+        rows = [[rng.choice('.#') for _ in range(width)] for _ in range(height)]
+        # vertical reflection, mirroring each row
+        column_line = rng.randint(1, width - 1)
+        rows = [mirrored(row, column_line) for row in rows]
+        # horizontal reflection on the upper half, leaving rows unmatched below
+        row_line = rng.randint(1, (height - 1) // 2)
+        rows = [list(row) for row in mirrored(rows, row_line)]
+        # the smudge goes in an unmatched row and in a reflected column
+        y = rng.randint(2 * row_line, height - 1)
+        span = min(column_line, width - column_line)
+        x = rng.randint(column_line - span, column_line - 1)
+        rows[y][x] = '#' if rows[y][x] == '.' else '.'
+        # random rows can reflect by chance, we discard those patterns
+        if has_only_expected_reflections(rows, row_line, column_line):
+            patterns.append('\n'.join(''.join(row) for row in rows))
+    return '\n\n'.join(patterns) + '\n'
+
+def day15(rng, scale):
+    """Comma separated steps adding or removing lenses"""
+    labels = shuffled_names(rng, 500 * scale)
+    steps = []
+    for _ in range(4000 * scale):
+        label = rng.choice(labels)
+        if rng.random() < 0.6:
+            steps.append(f'{label}={rng.randint(1, 9)}')
+        else:
+            steps.append(f'{label}-')
+    return ','.join(steps) + '\n'
+
+def day16(rng, scale):
+    """A contraption of empty space, mirrors and splitters"""
+    side = scaled_side(110, scale)
+    lines = []
+    for _ in range(side):
+        lines.append(''.join(rng.choice('/\\|-') if rng.random() < 0.1 else '.'
+                             for _ in range(side)))
+    return '\n'.join(lines) + '\n'
+
+def histogram_commands(rng, columns, max_width, max_height):
+    """Return the (direction, length) commands of the border of a histogram
+       shaped polygon, starting from its top left corner"""
+    heights = [rng.randint(1, max_height)]
+    for _ in range(columns - 1):
+        height = rng.randint(1, max_height - 1)
+        heights.append(height if height < heights[-1] else height + 1)
+    commands = []
+    total_width = 0
+    for i, height in enumerate(heights):
+        width = rng.randint(1, max_width)
+        total_width += width
+        commands.append(('R', width))
+        if i < len(heights) - 1:
+            step = heights[i + 1] - height
+            commands.append(('U', step) if step > 0 else ('D', -step))
+    commands.append(('D', heights[-1]))
+    commands.append(('L', total_width))
+    commands.append(('U', heights[0]))
+    return commands
+
+def day18(rng, scale):
+    """Dig plans tracing the border of two histogram shaped polygons: a
+       small one in the plain commands, a big one in the hex codes"""
+    columns = 302 * scale
+    plain = histogram_commands(rng, columns, 6, 300)
+    encoded = histogram_commands(rng, columns, 0xFFFFF // columns, 0xFFFFF)
+    hex_direction = {'R': '0', 'D': '1', 'L': '2', 'U': '3'}
+    return '\n'.join(
+        f'{direction} {length} (#{hex_length:05x}{hex_direction[hex_dir]})'
+        for (direction, length), (hex_dir, hex_length) in zip(plain, encoded)
+    ) + '\n'
+
+def day19(rng, scale):
+    """A tree of workflows starting from 'in' and a list of parts"""
+    count = 550 * scale
+    labels = ['in'] + shuffled_names(rng, count - 1, exclude={'in'})
+    workflows = []
+    next_label = 1
+    for i, label in enumerate(labels):
+        # keep the tree growing until all the labels are used
+        grow = next_label == i + 1
+        targets = []
+        for _ in range(rng.randint(2, 4)):
+            if next_label < count and (grow or rng.random() < 0.6):
+                targets.append(labels[next_label])
+                next_label += 1
+                grow = False
+            else:
+                targets.append(rng.choice('AR'))
+        conditions = [f'{rng.choice("xmas")}{rng.choice("<>")}'
+                      f'{rng.randint(1, 4000)}:{target}'
+                      for target in targets[:-1]]
+        workflows.append(label + '{' + ','.join(conditions + targets[-1:]) + '}')
+    rng.shuffle(workflows)
+    parts = ['{' + ','.join(f'{a}={rng.randint(1, 4000)}' for a in 'xmas') + '}'
+             for _ in range(200 * scale)]
+    return '\n'.join(workflows) + '\n\n' + '\n'.join(parts) + '\n'
+
+def day21(rng, scale):
+    """A square garden of odd side with the start in the center, on an empty
+       row and column"""
+    side = scaled_side(131, scale, odd=True)
+    center = side // 2
+    lines = []
+    for y in range(side):
+        row = ['#' if (rng.random() < 0.12 and x != center and y != center)
+               else '.' for x in range(side)]
+        if y == center:
+            row[center] = 'S'
+        lines.append(''.join(row))
+    return '\n'.join(lines) + '\n'
+
+def day22(rng, scale, side=10):
+    """Snapshots of bricks, grouped in horizontal layers where no two bricks
+       overlap, with an occasional vertical brick in its own layers"""
+    lines = []
+    z = 1
+    while len(lines) < 1223 * scale:
+        if rng.random() < 0.1:
+            x, y, height = rng.randrange(side), rng.randrange(side), rng.randint(1, 4)
+            lines.append(f'{x},{y},{z}~{x},{y},{z + height}')
+            z += height + 1
+            continue
+        along_x = rng.random() < 0.5
+        for row in rng.sample(range(side), rng.randint(1, 3)):
+            start = rng.randrange(side - 3)
+            end = start + rng.randint(0, 3)
+            if along_x:
+                lines.append(f'{start},{row},{z}~{end},{row},{z}')
+            else:
+                lines.append(f'{row},{start},{z}~{row},{end},{z}')
+        z += rng.randint(1, 2)
+    rng.shuffle(lines)
+    return '\n'.join(lines) + '\n'
+
+def day23(rng, scale, junctions=5):
+    """A maze of junctions on a lattice, linked by corridors with slopes
+       going right or down at both ends"""
+    spacing = scaled_side(24, scale)
+    side = spacing * (junctions + 1) + 1
+    grid = [['#'] * side for _ in range(side)]
+    positions = [spacing * (i + 1) for i in range(junctions)]
+    # jitter the lattice a bit so that corridors have different lengths
+    xs = [p + rng.randint(-spacing // 4, spacing // 4) for p in positions]
+    ys = [p + rng.randint(-spacing // 4, spacing // 4) for p in positions]
+
+    def corridor(x1, y1, x2, y2, slope):
+        for x in range(x1, x2 + 1):
+            for y in range(y1, y2 + 1):
+                grid[y][x] = '.'
+        if slope == '>':
+            grid[y1][x1 + 1] = grid[y2][x2 - 1] = '>'
+        else:
+            grid[y1 + 1][x1] = grid[y2 - 1][x2] = 'v'
+
+    for j, y in enumerate(ys):
+        for i, x in enumerate(xs):
+            if i < junctions - 1:
+                corridor(x, y, xs[i + 1], y, '>')
+            if j < junctions - 1:
+                corridor(x, y, x, ys[j + 1], 'v')
+    corridor(xs[0], 0, xs[0], ys[0], 'v')
+    corridor(xs[-1], ys[-1], xs[-1], side - 1, 'v')
+    return '\n'.join(''.join(row) for row in grid) + '\n'
+
+def day24(rng, scale):
+    """Hailstones that are all hit by a rock thrown from a hidden position
+       with a hidden velocity"""
+    rock = [rng.randint(10**14, 3 * 10**14) for _ in range(3)]
+    rock_velocity = [rng.randint(-300, 300) for _ in range(3)]
+    lines = []
+    times = rng.sample(range(10**11, 10**12), 300 * scale)
+    for t in times:
+        velocity = [rng.randint(-300, 300) for _ in range(3)]
+        velocity = [v + 1 if v == rv else v for v, rv in zip(velocity, rock_velocity)]
+        position = [p + (rv - v) * t
+                    for p, v, rv in zip(rock, velocity, rock_velocity)]
+        lines.append(', '.join(map(str, position)) + ' @ ' +
+                     ', '.join(map(str, velocity)))
+    return '\n'.join(lines) + '\n'
+
+def day25(rng, scale, degree=4):
+    """Two well connected groups of components linked by exactly three
+       wires"""
+    count = 1500 * scale
+    components = shuffled_names(rng, count)
+    groups = [components[:count // 2], components[count // 2:]]
+    edges = []
+    for group in groups:
+        for i, component in enumerate(group[1:], start=1):
+            for other in rng.sample(group[:i], min(i, degree)):
+                edges.append((component, other))
+    edges.extend(zip(rng.sample(groups[0], 3), rng.sample(groups[1], 3)))
+    wires = {}
+    for a, b in edges:
+        if rng.random() < 0.5:
+            a, b = b, a
+        wires.setdefault(a, []).append(b)
+    lines = [f'{a}: {" ".join(others)}' for a, others in wires.items()]
+    rng.shuffle(lines)
+    return '\n'.join(lines) + '\n'
+
+##########################################################################
+
+GENERATORS = {
+    1: day1, 2: day2, 4: day4, 5: day5, 6: day6, 8: day8, 9: day9,
+    11: day11, 12: day12, 13: day13, 15: day15, 16: day16, 18: day18,
+    19: day19, 21: day21, 22: day22, 23: day23, 24: day24, 25: day25,
+}
+
+def generate(day, scale=1, seed=0):
+    """Return a synthetic input for day, scale times the size of the puzzle
+       input. Raise ValueError if there is no generator for the day or it
+       cannot produce an input that big."""
+    if day not in GENERATORS:
+        raise ValueError(f'No input generator for day {day}')
+    return GENERATORS[day](random.Random(seed), scale)
@@ -0,0 +1,87 @@
+import loader
+
+# A 2D grid of characters on a uint8 numpy array, shared by the grid days.
+
+# The grid can be padded with a border of a fill character (e.g. a wall '#'),
+# so that hot loops can walk it by flat index and stop at the border instead
+# of checking bounds at every step: the neighbours of the cell at flat index
+# i are i + offset for offset in grid.offsets.
+
+# The numpy array is meant for vectorized work (rows, columns, masks), while
+# for scalar access in hot loops `grid.cells` is a bytes copy of the padded
+# array, which is much faster to index than the array itself.
+
+# numpy is imported by the methods that need it and not at the top, so that
+# importing a day does not pay for it (more than 100ms) until it builds a grid.
+
+# east, west, south, north, in the same order as Grid.offsets
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+class Grid:
+    def __init__(self, array, pad=0, fill='#'):
+        """Take a 2D uint8 array of the cells and build a grid padded with
+           pad cells of fill character on each side"""
+        import numpy as np
+        self.height, self.width = array.shape
+        self.pad = pad
+        self.fill = ord(fill)
+        self.array = np.pad(array, pad, constant_values=self.fill)
+        self.stride = self.width + 2 * pad
+        self.cells = self.array.tobytes()
+        self.offsets = (1, -1, self.stride, -self.stride)
+
+    @classmethod
+    def from_lines(cls, lines, pad=0, fill='#'):
+        """Build a grid from a list of strings of the same length"""
+        import numpy as np
+        array = np.frombuffer(''.join(lines).encode(), dtype=np.uint8)
+        return cls(array.reshape(len(lines), -1), pad, fill)
+
+    @classmethod
+    def from_text(cls, text, pad=0, fill='#'):
+        """Build a grid from a text of lines of the same length"""
+        return cls.from_lines(loader.split_lines(text), pad, fill)
+
+    @classmethod
+    def from_file(cls, path, pad=0, fill='#'):
+        """Build a grid from a file of lines of the same length"""
+        import numpy as np
+        with loader.InputFile(path) as file:
+            byte_grid = file.grid()
+            view = np.ndarray((byte_grid.height, byte_grid.width), np.uint8,
+                              buffer=file.data, strides=(byte_grid.stride, 1))
+            grid = cls(view, pad, fill)
+            del view, byte_grid
+        return grid
+
+    def view(self):
+        """Return the grid without padding, as a 2D array view"""
+        p = self.pad
+        return self.array[p:p + self.height, p:p + self.width]
+
+    def row(self, y):
+        return self.view()[y]
+
+    def column(self, x):
+        return self.view()[:, x]
+
+    def index(self, x, y):
+        """Return the flat index of the cell at x, y"""
+        return (y + self.pad) * self.stride + x + self.pad
+
+    def position(self, index):
+        """Return the x, y position of the cell at a flat index"""
+        y, x = divmod(index, self.stride)
+        return x - self.pad, y - self.pad
+
+    def find(self, char):
+        """Return the flat indexes of all the cells with char, in row order"""
+        import numpy as np
+        return np.flatnonzero(self.array == ord(char)).tolist()
+
+    def tiled(self, copies):
+        """Return a new grid with copies x copies tiles of this grid, with
+           the same padding"""
+        import numpy as np
+        return Grid(np.tile(self.view(), (copies, copies)),
+                    self.pad, chr(self.fill))
@@ -0,0 +1,97 @@
+import sys
+import argparse
+from collections import Counter
+
+# Command line entry point of the days, with profiling options.
+
+# Usage (from the python directory):
+#   python day16.py                      # both parts
+#   python day16.py 2                    # only part 2
+#   python day16.py 2 --profile          # cProfile the answer
+#   python day16.py --trace-memory       # peak memory allocated by each part
+#   python day16.py --counters           # counters of the hot loops
+
+# The hot loops of some days count their key events (beam states expanded,
+# paths cloned, ...) with count(). Counting is off unless ENABLED is set, and
+# the days add up their counts once per call rather than at every step of the
+# loop, so that it costs nothing when off.
+
+ENABLED = False
+
+COUNTERS = Counter()
+
+# how many functions of the profile to report
+PROFILE_LINES = 25
+
+def count(name, value=1):
+    """Add value to the counter name"""
+    COUNTERS[name] += value
+
+def profiled(func):
+    """Return a function running func under cProfile and printing its
+       statistics on stderr, sorted by cumulative time"""
+    import cProfile
+    import pstats
+    def wrapper():
+        profile = cProfile.Profile()
+        answer = profile.runcall(func)
+        stats = pstats.Stats(profile, stream=sys.stderr)
+        stats.sort_stats('cumulative').print_stats(PROFILE_LINES)
+        return answer
+    return wrapper
+
+def memory_traced(func):
+    """Return a function running func while tracing memory allocations and
+       printing the peak on stderr"""
+    import tracemalloc
+    def wrapper():
+        tracemalloc.start()
+        try:
+            answer = func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        print(f'peak memory: {peak // 1024} KB', file=sys.stderr)
+        return answer
+    return wrapper
+
+def counted(func):
+    """Return a function running func with the counters on and printing
+       them on stderr"""
+    def wrapper():
+        global ENABLED  # pylint: disable=global-statement
+        COUNTERS.clear()
+        ENABLED = True
+        try:
+            answer = func()
+        finally:
+            ENABLED = False
+        for name, value in sorted(COUNTERS.items()):
+            print(f'{name}: {value}', file=sys.stderr)
+        return answer
+    return wrapper
+
+def main(answers, print_and_test, argv=None):
+    """Run the answers of a day. answers is a list of (answer function,
+       correct answer) for part 1 and part 2."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('part', nargs='?', type=int, choices=[1, 2],
+                        help='only run this part (default both)')
+    parser.add_argument('--profile', action='store_true',
+                        help='profile the answers with cProfile')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='report the peak memory allocated by the answers')
+    parser.add_argument('--counters', action='store_true',
+                        help='report the counters of the hot loops')
+    args = parser.parse_args(argv)
+
+    for part, (func, correct_answer) in enumerate(answers, 1):
+        if args.part not in (None, part):
+            continue
+        if args.counters:
+            func = counted(func)
+        if args.trace_memory:
+            func = memory_traced(func)
+        if args.profile:
+            func = profiled(func)
+        print_and_test(func, correct_answer)
@@ -0,0 +1,130 @@
+import os
+import mmap
+
+# Shared input loader. The input file is memory mapped and exposed as:
+#   - 2D grids of bytes and chunks of lines, over the mapped file with no copy
+#   - decoded text, lines and blocks for the days that work on strings: the
+#     whole file is decoded from the mapped file at once and split in lines,
+#     which is faster than decoding each line from its own slice, and unlike
+#     `line.strip() for line in file.readlines()` a line is only copied when
+#     it has trailing whitespace to strip
+
+WHITESPACE = b' \t\r\n'
+
+class ByteGrid:
+    """A 2D grid of bytes over a memoryview of lines of the same width,
+       each one followed by a newline. grid[x, y] is the byte at column x and
+       row y, as an int."""
+    def __init__(self, data, width, height):
+        self.data = data
+        self.width = width
+        self.height = height
+        self.stride = width + 1
+
+    def __getitem__(self, pos):
+        x, y = pos
+        return self.data[y * self.stride + x]
+
+    def row(self, y):
+        """Return row y as a memoryview"""
+        start = y * self.stride
+        return self.data[start:start + self.width]
+
+class InputFile:
+    """A memory mapped input file. The memoryviews it returns are valid until
+       the file is closed, and must be released before closing it."""
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.data = memoryview(self._mmap)
+            else:
+                self._mmap = None
+                self.data = memoryview(b'')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self.data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def line_bounds(self):
+        """Generate (start, end) of each line, excluding the newline and the
+           trailing whitespace, and excluding the empty line after the last
+           newline"""
+        data = self.data
+        size = len(data)
+        start = 0
+        while start < size:
+            end = self._mmap.find(b'\n', start)
+            if end == -1:
+                end = size
+            next_start = end + 1
+            while end > start and data[end - 1] in WHITESPACE:
+                end -= 1
+            yield start, end
+            start = next_start
+
+    def grid(self):
+        """Return the file as a ByteGrid. All lines must have the same width."""
+        bounds = list(self.line_bounds())
+        width = bounds[0][1] - bounds[0][0]
+        for y, (start, end) in enumerate(bounds):
+            if start != y * (width + 1) or end - start != width:
+                raise ValueError(f'Line {y + 1} is not {width} bytes wide')
+        return ByteGrid(self.data, width, len(bounds))
+
+    def chunk_bounds(self, chunk_size):
+        """Return (start, end) of consecutive chunks of the file of about
+           chunk_size bytes, each one but the last ending after a newline,
+           so that no line is split between two chunks"""
+        bounds = []
+        size = len(self.data)
+        start = 0
+        while start < size:
+            end = self._mmap.find(b'\n', min(start + chunk_size, size) - 1)
+            end = size if end == -1 else end + 1
+            bounds.append((start, end))
+            start = end
+        return bounds
+
+    def text(self):
+        """Return the whole file decoded as a string"""
+        return str(self.data, 'utf-8')
+
+def read_text(path):
+    """Return the content of the file at path as a string"""
+    with InputFile(path) as file:
+        return file.text()
+
+def split_lines(text):
+    """Return the lines of text stripped of trailing whitespace"""
+    return [line.rstrip() for line in text.splitlines()]
+
+def split_blocks(text):
+    """Return the blocks of lines of text separated by blank lines, as lists
+       of strings"""
+    blocks = [[]]
+    for line in split_lines(text):
+        if line:
+            blocks[-1].append(line)
+        elif blocks[-1]:
+            blocks.append([])
+    if not blocks[-1]:
+        blocks.pop()
+    return blocks
+
+def read_lines(path):
+    """Return the lines of the file at path as strings stripped of trailing
+       whitespace"""
+    return split_lines(read_text(path))
+
+def read_blocks(path):
+    """Return the blocks of lines of the file at path separated by blank
+       lines, as lists of strings"""
+    return split_blocks(read_text(path))
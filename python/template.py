@@ -1,25 +1,40 @@
-import sys
+import instrument
+import loader
 
 
 # PART 1
 
+INPUTFILE = '../input/XXX'
+
 def read_input_into_lines():
     """Read the input file and return it as a list of lines stripped of
        leading or trailing whitespace."""
-    with open('../input/XXX', 'r', encoding='utf-8') as file:
-        return [line.strip() for line in file.readlines()]
+    return loader.read_lines(INPUTFILE)
+
+def part_1(lines):
+    pass
 
 CORRECT_ANSWER_1 = None
 def answer_1():
-    pass
+    return part_1(read_input_into_lines())
 
 ##########################################################################
 
 # PART 2
 
+def part_2(lines):
+    pass
+
 CORRECT_ANSWER_2 = None
 def answer_2():
-    pass
+    return part_2(read_input_into_lines())
+
+##########################################################################
+
+def solve(text):
+    """Return the answers of part 1 and part 2 for the input text"""
+    lines = loader.split_lines(text)
+    return part_1(lines), part_2(lines)
 
 ##########################################################################
 
@@ -31,9 +46,6 @@ def print_and_test(func, correct_answer=None):
 
 if __name__ == "__main__":
     # if no argument, run all answers, otherwise only part 1 or 2
-    if len(sys.argv) == 1 or sys.argv[1] == '1':
-        print_and_test(answer_1, CORRECT_ANSWER_1)
-    if len(sys.argv) == 1 or sys.argv[1] == '2':
-        print_and_test(answer_2, CORRECT_ANSWER_2)
-    if len(sys.argv) > 1 and sys.argv[1] not in ['1', '2']:
-        print('Give 1 or 2 as argument, or no argument at all')
+    # see instrument.py for the profiling options
+    instrument.main([(answer_1, CORRECT_ANSWER_1), (answer_2, CORRECT_ANSWER_2)],
+                    print_and_test)